@@ -1,32 +1,87 @@
-import os
 import logging
 import time
-import csv
-import io
 import asyncio
+import math
+import re
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException, Header, status, Depends
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict
-from collections import defaultdict, deque
-from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from collections import Counter, OrderedDict
+try:
+    import orjson
+except ImportError:  # error bodies fall back to the stdlib encoder
+    orjson = None
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # rate limits stay per process without redis
+    aioredis = RedisError = None
 from enhanced_amazon_agent import EnhancedAmazonProductAgent
-from config import Config
+from config import setting
 
 # --- ENVIRONMENT ---
-load_dotenv()
-API_KEY = os.getenv("BACKEND_API_KEY", "changeme")
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
-RATE_LIMIT = int(os.getenv("RATE_LIMIT", 10))
-RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", 60))
+# Loaded by config: settings.py first, then the environment and .env
+API_KEY = setting("BACKEND_API_KEY", "changeme")
+CORS_ORIGINS = setting("CORS_ORIGINS", "*").split(",")
+RATE_LIMIT = int(setting("RATE_LIMIT", "10"))
+RATE_LIMIT_WINDOW = int(setting("RATE_LIMIT_WINDOW", "60"))
+BULK_CONCURRENCY = int(setting("BULK_CONCURRENCY", "20"))
+BULK_MAX = int(setting("BULK_MAX", "1000"))
+MAX_BODY_BYTES = int(setting("MAX_BODY_BYTES", str(1024 * 1024)))
+REDIS_URL = setting("REDIS_URL", "")
 
 # --- LOGGING ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger("backend_api")
 
+# --- RESPONSES ---
+# orjson-rendered JSON for responses without a response model; routes that declare
+# one are already serialised straight to bytes by pydantic
+if orjson is not None:
+    class ORJSONResponse(JSONResponse):
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content)
+else:
+    ORJSONResponse = JSONResponse
+
 # --- FASTAPI APP ---
-app = FastAPI(title="Amazon Product Data Agent API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One agent per process, so its HTTP connection pool and result cache outlive a request
+    async with EnhancedAmazonProductAgent() as agent:
+        app.state.agent = agent
+        
+        # Share rate limits between workers through redis when it is configured
+        redis_client = None
+        app.state.rate_limit_script = None
+        if REDIS_URL and aioredis is not None:
+            # Short timeouts so an unreachable redis falls back quickly instead of stalling requests
+            redis_client = aioredis.from_url(REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+            app.state.rate_limit_script = redis_client.register_script(RATE_LIMIT_LUA)
+        elif REDIS_URL:
+            logger.warning("REDIS_URL is set but redis is not installed; rate limits are per process")
+        try:
+            yield
+        finally:
+            if redis_client is not None:
+                await redis_client.aclose()
+
+app = FastAPI(title="Amazon Product Data Agent API", version="1.0.0", lifespan=lifespan)
+
+# Registered before CORS so CORS stays the outer layer and its headers reach the 413 too
+@app.middleware("http")
+async def limit_body_size(request: Request, call_next):
+    # Refuse declared oversized bodies before they are read and parsed
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_BODY_BYTES:
+        logger.warning("Rejected request body of %s bytes", content_length)
+        return ORJSONResponse(status_code=413, content={"error": f"Request body too large: limit is {MAX_BODY_BYTES} bytes"})
+    return await call_next(request)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"] if CORS_ORIGINS == ["*"] else CORS_ORIGINS,
@@ -35,38 +90,157 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-# --- RATE LIMITING ---
-rate_limiters: Dict[str, deque] = defaultdict(lambda: deque())
-def rate_limiter(x_api_key: str = Header(...)):
-    now = time.time()
-    window_start = now - RATE_LIMIT_WINDOW
-    dq = rate_limiters[x_api_key]
-    while dq and dq[0] < window_start:
-        dq.popleft()
-    if len(dq) >= RATE_LIMIT:
-        logger.warning(f"Rate limit exceeded for API key: {x_api_key}")
-        raise HTTPException(status_code=429, detail=f"Rate limit exceeded: {RATE_LIMIT} requests per {RATE_LIMIT_WINDOW} seconds")
-    dq.append(now)
-
 # --- AUTH ---
-def api_key_auth(x_api_key: str = Header(...)):
+def api_key_auth(x_api_key: str = Header(...)) -> str:
     if x_api_key != API_KEY:
-        logger.warning(f"Unauthorized access attempt with API key: {x_api_key}")
+        logger.warning("Unauthorized access attempt with API key: %s", x_api_key)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API Key")
+    return x_api_key
+
+# --- RATE LIMITING ---
+RATE_LIMIT_REFILL = RATE_LIMIT / RATE_LIMIT_WINDOW
+
+# Token bucket kept in a redis hash, refilled and spent atomically for all workers.
+# Returns {allowed, tokens left}; idle keys expire once the bucket would be full again.
+RATE_LIMIT_LUA = """
+local capacity = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * capacity / window)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(window))
+return {allowed, tostring(tokens)}
+"""
+
+# In-process token bucket per API key: [tokens left, last refill time],
+# least recently used keys dropped first once RATE_LIMIT_MAX_KEYS is reached
+RATE_LIMIT_MAX_KEYS = 10_000
+rate_buckets: "OrderedDict[str, list]" = OrderedDict()
+def take_local_token(x_api_key: str) -> Tuple[bool, float]:
+    bucket = rate_buckets.get(x_api_key)
+    if bucket is None:
+        if len(rate_buckets) >= RATE_LIMIT_MAX_KEYS:
+            rate_buckets.popitem(last=False)
+        bucket = rate_buckets[x_api_key] = [float(RATE_LIMIT), time.monotonic()]
+    else:
+        rate_buckets.move_to_end(x_api_key)
+    now = time.monotonic()
+    bucket[0] = min(RATE_LIMIT, bucket[0] + (now - bucket[1]) * RATE_LIMIT_REFILL)
+    bucket[1] = now
+    if bucket[0] < 1.0:
+        return False, bucket[0]
+    bucket[0] -= 1.0
+    return True, bucket[0]
+
+async def rate_limiter(request: Request, x_api_key: str = Depends(api_key_auth)):
+    # Keyed on the key api_key_auth accepted, so unknown keys never get a bucket
+    script = request.app.state.rate_limit_script
+    allowed = None
+    if script is not None:
+        try:
+            allowed, tokens = await script(keys=[f"rl:{x_api_key}"], args=[RATE_LIMIT, RATE_LIMIT_WINDOW, time.time()])
+            allowed, tokens = bool(allowed), float(tokens)
+        except RedisError as e:
+            logger.error("Redis rate limiter unavailable, using the in-process limiter: %s", e)
+            allowed = None
+    if allowed is None:
+        # Runs on the event loop, so the bucket update never interleaves with another request
+        allowed, tokens = take_local_token(x_api_key)
+    request.state.rate_limit_tokens = tokens
+    if not allowed:
+        logger.warning("Rate limit exceeded for API key: %s", x_api_key)
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded: {RATE_LIMIT} requests per {RATE_LIMIT_WINDOW} seconds",
+            headers={"Retry-After": str(math.ceil((1.0 - tokens) / RATE_LIMIT_REFILL))}
+        )
+
+@app.middleware("http")
+async def rate_limit_headers(request: Request, call_next):
+    response = await call_next(request)
+    tokens = getattr(request.state, "rate_limit_tokens", None)
+    if tokens is not None:
+        response.headers["X-RateLimit-Limit"] = str(RATE_LIMIT)
+        response.headers["X-RateLimit-Remaining"] = str(int(tokens))
+        response.headers["X-RateLimit-Reset"] = str(math.ceil((RATE_LIMIT - tokens) / RATE_LIMIT_REFILL))
+    return response
+
+# --- CSV EXPORT ---
+CSV_HEADER = b"URL,ASIN,Product Name,Price,Currency,Domain,Status,Description,Error\r\n"
+CURRENCY_RE = re.compile(r"[$₹€£]")
+
+def csv_field(value: Any) -> str:
+    # csv.writer's default (excel, QUOTE_MINIMAL) quoting, without the StringIO round trip
+    if not isinstance(value, str):
+        value = "" if value is None else str(value)
+    if '"' in value or "," in value or "\n" in value or "\r" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def encode_csv_row(row: tuple) -> bytes:
+    return (",".join(map(csv_field, row)) + "\r\n").encode()
+
+def csv_row(r: dict) -> tuple:
+    url = r.get("input_received", "")
+    p = r.get("price") or {}
+    discounted = p.get("discounted")
+    original = p.get("original")
+    price = discounted or original
+    # Providers such as Rainforest report numeric values, which carry no symbol
+    price = "" if price is None else str(price)
+    currency = ""
+    for val in (discounted, original):
+        m = isinstance(val, str) and CURRENCY_RE.search(val)
+        if m:
+            currency = m.group(0)
+            break
+    try:
+        domain = urlparse(url).hostname or "" if url else ""
+    except ValueError:
+        domain = ""
+    return (
+        url, r.get("asin", ""), r.get("product_name", ""), price, currency, domain,
+        "Error" if "error" in r else "OK", (r.get("description") or "")[:200], r.get("error", "")
+    )
+
+# --- BULK CONCURRENCY ---
+# Caps in-flight lookups across all bulk requests
+bulk_semaphore = asyncio.BoundedSemaphore(BULK_CONCURRENCY)
+
+# --- AGENT ---
+# Checked once; a blocking agent is run in a worker thread instead of on the event loop
+AGENT_IS_ASYNC = asyncio.iscoroutinefunction(getattr(EnhancedAmazonProductAgent, "get_product_info", None))
+
+def get_agent(request: Request) -> EnhancedAmazonProductAgent:
+    return request.app.state.agent
 
 # --- MODELS ---
+# Strict, immutable models: unknown fields are rejected rather than silently dropped
+MODEL_CONFIG = ConfigDict(extra="forbid", str_strip_whitespace=True, frozen=True)
+
 class ScrapeRequest(BaseModel):
+    model_config = MODEL_CONFIG
     url: str
 
 class ScrapeResponse(BaseModel):
-    data: dict
+    model_config = MODEL_CONFIG
+    data: Dict[str, Any]
 
 class ErrorResponse(BaseModel):
+    model_config = MODEL_CONFIG
     error: str
     detail: Optional[str] = None
 
 # --- HEALTH CHECK ---
-@app.get("/health", tags=["Health"])
+@app.get("/health", response_class=ORJSONResponse, tags=["Health"])
 def health():
     return {"status": "ok"}
 
@@ -74,85 +248,90 @@ def health():
 @app.post("/scrape", response_model=ScrapeResponse, responses={400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 429: {"model": ErrorResponse}}, tags=["Scraping"])
 async def scrape(
     request: ScrapeRequest,
-    x_api_key: str = Depends(api_key_auth),
-    _rate_limit: None = Depends(rate_limiter)
+    # Authenticates first: rate_limiter depends on api_key_auth
+    _rate_limit: None = Depends(rate_limiter),
+    agent: EnhancedAmazonProductAgent = Depends(get_agent)
 ):
-    logger.info(f"Received scrape request: {request.url}")
-    agent = EnhancedAmazonProductAgent()
+    logger.info("Received scrape request: %s", request.url)
     try:
-        if hasattr(agent, "get_product_info") and asyncio.iscoroutinefunction(agent.get_product_info):
+        if AGENT_IS_ASYNC:
             result = await agent.get_product_info(request.url)
         else:
-            result = agent.get_product_info_sync(request.url)
+            result = await asyncio.to_thread(agent.get_product_info_sync, request.url)
         if "error" in result:
-            logger.error(f"Scraping error: {result['error']} | Input: {request.url}")
+            logger.error("Scraping error: %s | Input: %s", result["error"], request.url)
             raise HTTPException(status_code=400, detail=result["error"])
-        logger.info(f"Scraping successful for: {request.url}")
+        logger.info("Scraping successful for: %s", request.url)
         return {"data": result}
     except HTTPException:
         raise
     except Exception as e:
-        logger.exception(f"Internal error during scraping: {e}")
+        logger.exception("Internal error during scraping: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 # --- BULK CSV EXPORT ENDPOINT ---
 @app.post("/bulk-csv", tags=["Bulk"])
 async def bulk_csv(
     request: ScrapeRequest,
-    x_api_key: str = Depends(api_key_auth),
-    _rate_limit: None = Depends(rate_limiter)
+    # Authenticates first: rate_limiter depends on api_key_auth
+    _rate_limit: None = Depends(rate_limiter),
+    agent: EnhancedAmazonProductAgent = Depends(get_agent)
 ):
     """
     Accepts a list of URLs/ASINs (newline-separated in request.url), returns a CSV file.
     """
     lines = [line.strip() for line in request.url.splitlines() if line.strip()]
-    agent = EnhancedAmazonProductAgent()
-    results = []
-    for line in lines:
-        if hasattr(agent, "get_product_info") and asyncio.iscoroutinefunction(agent.get_product_info):
-            result = await agent.get_product_info(line)
-        else:
-            result = agent.get_product_info_sync(line)
-        result["input_received"] = line
-        results.append(result)
-
-    # Prepare CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-    header = ["URL", "ASIN", "Product Name", "Price", "Currency", "Domain", "Status", "Description", "Error"]
-    writer.writerow(header)
-    for r in results:
-        url = r.get("input_received", "")
-        asin = r.get("asin", "")
-        name = r.get("product_name", "")
-        price = r.get("price", {}).get("discounted") or r.get("price", {}).get("original") or ""
-        currency = ""
-        if "price" in r:
-            for val in [r["price"].get("discounted"), r["price"].get("original")]:
-                if val and any(c in val for c in "$₹€£"):
-                    currency = next((c for c in "$₹€£" if c in val), "")
-                    break
-        domain = ""
+    if len(lines) > BULK_MAX:
+        raise HTTPException(status_code=413, detail=f"Too many inputs: {len(lines)} > {BULK_MAX}")
+    # Each distinct input is looked up once; its row is repeated for every copy
+    line_counts = Counter(lines)
+
+    async def row_iter():
+        yield CSV_HEADER
+
+        async def lookup(line: str) -> dict:
+            try:
+                async with bulk_semaphore:
+                    if AGENT_IS_ASYNC:
+                        result = await agent.get_product_info(line)
+                    else:
+                        result = await asyncio.to_thread(agent.get_product_info_sync, line)
+            except Exception as e:
+                logger.exception("Bulk lookup failed for %s: %s", line, e)
+                result = {"error": str(e)}
+            result["input_received"] = line
+            return result
+
+        # Look everything up concurrently and write rows in completion order
+        tasks = [asyncio.create_task(lookup(line)) for line in line_counts]
         try:
-            domain = url and __import__("urllib.parse").urlparse(url).hostname or ""
-        except Exception:
-            pass
-        status = "Error" if "error" in r else "OK"
-        desc = r.get("description", "")[:200]
-        error = r.get("error", "")
-        writer.writerow([url, asin, name, price, currency, domain, status, desc, error])
-    output.seek(0)
-    return StreamingResponse(output, media_type="text/csv", headers={
+            for next_done in asyncio.as_completed(tasks):
+                r = await next_done
+                line = r["input_received"]
+                # Each row goes out as soon as its lookup finishes; a row that cannot be
+                # built becomes an Error row so the rest of the stream still goes out
+                try:
+                    row = encode_csv_row(csv_row(r))
+                except Exception as e:
+                    logger.exception("Could not build CSV row for %s: %s", line, e)
+                    row = encode_csv_row(csv_row({"input_received": line, "error": str(e)}))
+                yield row * line_counts[line]
+        finally:
+            # Stop outstanding lookups if the client goes away mid-stream
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(row_iter(), media_type="text/csv", headers={
         "Content-Disposition": "attachment; filename=amazon_bulk_report.csv"
     })
 
 # --- ERROR HANDLERS ---
 @app.exception_handler(HTTPException)
 def http_exception_handler(request: Request, exc: HTTPException):
-    logger.error(f"HTTPException: {exc.detail} (status {exc.status_code})")
-    return JSONResponse(status_code=exc.status_code, content={"error": exc.detail})
+    logger.error("HTTPException: %s (status %s)", exc.detail, exc.status_code)
+    return ORJSONResponse(status_code=exc.status_code, content={"error": exc.detail}, headers=exc.headers)
 
 @app.exception_handler(Exception)
 def unhandled_exception_handler(request: Request, exc: Exception):
-    logger.exception(f"Unhandled exception: {exc}")
-    return JSONResponse(status_code=500, content={"error": "Internal server error"}) 
\ No newline at end of file
+    logger.exception("Unhandled exception: %s", exc)
+    return ORJSONResponse(status_code=500, content={"error": "Internal server error"}) 
\ No newline at end of file
@@ -2,35 +2,174 @@
 Configuration file for Amazon Product Data Agent
 """
 
+import importlib.util
 import os
-from dotenv import load_dotenv
+import random
+from functools import cached_property
+from itertools import cycle
+from threading import Lock
+from types import MappingProxyType, ModuleType
+from typing import ClassVar, Dict, Final, Mapping, Optional, Tuple
+from aiohttp import ClientTimeout
+from yarl import URL
 
-# Load environment variables
-load_dotenv()
+
+def _find_dotenv() -> Optional[str]:
+    """Locate a .env file next to this module or in one of its parent directories"""
+    path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(path, '.env')
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _load_settings() -> Optional[ModuleType]:
+    """Import settings.py from this directory, not whatever 'settings' is on sys.path"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.py')
+    if not os.path.isfile(path):
+        return None
+    # A regular source loader, so the module is still served from the .pyc cache
+    spec = importlib.util.spec_from_file_location('_backend_settings', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Prefer a plain Python settings module over .env
+_settings = _load_settings()
+
+# Load environment variables once per process; re-imports skip the .env parse,
+# and so do setups where settings.py or the environment already provide every key
+_DOTENV_SENTINEL: Final[str] = '_BACKEND_DOTENV_LOADED'
+# Every setting read through setting(), by this module and by backend_api
+_SETTING_KEYS: Final[Tuple[str, ...]] = (
+    'RAINFOREST_API_KEY', 'SCRAPERAPI_KEY', 'RAPIDAPI_KEY',
+    'BACKEND_API_KEY', 'CORS_ORIGINS', 'RATE_LIMIT', 'RATE_LIMIT_WINDOW',
+    'BULK_CONCURRENCY', 'BULK_MAX', 'MAX_BODY_BYTES', 'REDIS_URL'
+)
+if (os.environ.get(_DOTENV_SENTINEL) != '1'
+        and not all(getattr(_settings, key, None) or key in os.environ for key in _SETTING_KEYS)):
+    # Only import python-dotenv when there is actually a file to parse
+    _dotenv_path = _find_dotenv()
+    if _dotenv_path:
+        from dotenv import load_dotenv
+        load_dotenv(_dotenv_path, override=False)
+        os.environ[_DOTENV_SENTINEL] = '1'
+
+# Snapshot of the environment taken once; all config reads are plain dict lookups
+_env: Final[Dict[str, str]] = dict(os.environ)
+
+
+def setting(name: str, default: str) -> str:
+    """Read a setting from settings.py if present, otherwise from the environment"""
+    return getattr(_settings, name, None) or _env.get(name, default)
 
 class Config:
     """Configuration class for API keys and settings"""
     
-    # API Keys (replace with your actual keys)
-    RAINFOREST_API_KEY = os.getenv('RAINFOREST_API_KEY', 'demo')
-    SCRAPERAPI_KEY = os.getenv('SCRAPERAPI_KEY', 'demo')
-    RAPIDAPI_KEY = os.getenv('RAPIDAPI_KEY', 'demo')
+    # API Keys (replace with your actual keys), read on first use
+    @cached_property
+    def RAINFOREST_API_KEY(self) -> str:
+        return setting('RAINFOREST_API_KEY', 'demo')
+    
+    @cached_property
+    def SCRAPERAPI_KEY(self) -> str:
+        return setting('SCRAPERAPI_KEY', 'demo')
+    
+    @cached_property
+    def RAPIDAPI_KEY(self) -> str:
+        return setting('RAPIDAPI_KEY', 'demo')
+    
+    # Read-only per-provider request templates; callers add the per-request fields
+    @cached_property
+    def RAINFOREST_PARAMS(self) -> Mapping[str, str]:
+        return MappingProxyType({
+            'api_key': self.RAINFOREST_API_KEY,
+            'type': 'product',
+            'amazon_domain': 'amazon.com'
+        })
+    
+    @cached_property
+    def SCRAPERAPI_PARAMS(self) -> Mapping[str, str]:
+        return MappingProxyType({'api_key': self.SCRAPERAPI_KEY})
+    
+    @cached_property
+    def RAPIDAPI_HEADERS(self) -> Mapping[str, str]:
+        return MappingProxyType({
+            'x-rapidapi-key': self.RAPIDAPI_KEY,
+            'x-rapidapi-host': self.RAPIDAPI_ENDPOINT.host,
+            'Accept': 'application/json'
+        })
     
     # API Endpoints
-    RAINFOREST_URL = 'https://api.rainforestapi.com/request'
-    SCRAPERAPI_URL = 'https://api.scraperapi.com/'
-    RAPIDAPI_URL = 'https://amazon-product-reviews-keywords.p.rapidapi.com/product/search'
+    RAINFOREST_URL: ClassVar[str] = 'https://api.rainforestapi.com/request'
+    SCRAPERAPI_URL: ClassVar[str] = 'https://api.scraperapi.com/'
+    RAPIDAPI_URL: ClassVar[str] = 'https://amazon-product-reviews-keywords.p.rapidapi.com/product/search'
+    
+    # Endpoints parsed once, so aiohttp call sites skip re-parsing the URL string
+    RAINFOREST_ENDPOINT: ClassVar[URL] = URL(RAINFOREST_URL)
+    SCRAPERAPI_ENDPOINT: ClassVar[URL] = URL(SCRAPERAPI_URL)
+    RAPIDAPI_ENDPOINT: ClassVar[URL] = URL(RAPIDAPI_URL)
     
     # Request settings
-    REQUEST_TIMEOUT = 30
-    MAX_RETRIES = 3
-    RETRY_DELAY = 1
+    REQUEST_TIMEOUT: ClassVar[int] = 30
+    MAX_RETRIES: ClassVar[int] = 3
+    RETRY_DELAY: ClassVar[int] = 1
+    CLIENT_TIMEOUT: ClassVar[ClientTimeout] = ClientTimeout(total=REQUEST_TIMEOUT)
+    
+    # Connection pool settings for the shared HTTP session
+    POOL_LIMIT: ClassVar[int] = 100
+    POOL_LIMIT_PER_HOST: ClassVar[int] = 10
+    DNS_CACHE_TTL: ClassVar[int] = 300
+    KEEPALIVE_TIMEOUT: ClassVar[int] = 30
+    
+    # Direct Amazon fetch throttling, per storefront
+    DIRECT_CONCURRENCY: ClassVar[int] = 8
+    DIRECT_REQUEST_SPACING: ClassVar[Tuple[float, float]] = (0.1, 0.3)
+    
+    # Per-agent cache of successful product lookups
+    RESULT_CACHE_SIZE: ClassVar[int] = 1024
+    RESULT_CACHE_TTL: ClassVar[int] = 600
     
     # User agents for rotation
-    USER_AGENTS = [
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:89.0) Gecko/20100101 Firefox/89.0'
-    ] 
\ No newline at end of file
+    USER_AGENTS: ClassVar[Tuple[str, ...]] = (
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    )
+    
+    # Browser-like headers for direct page requests
+    HEADERS: ClassVar[Mapping[str, str]] = MappingProxyType({
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'Cache-Control': 'max-age=0'
+    })
+
+
+# Shared instance so each API key is looked up at most once per process
+config: Final[Config] = Config()
+
+
+# Round-robin over a once-shuffled copy of the user agents
+_user_agent_cycle = cycle(random.sample(Config.USER_AGENTS, len(Config.USER_AGENTS)))
+_user_agent_lock = Lock()
+
+
+def next_user_agent() -> str:
+    """Return the next user agent in the rotation"""
+    with _user_agent_lock:
+        return next(_user_agent_cycle)
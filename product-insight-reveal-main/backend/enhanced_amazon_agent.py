@@ -7,102 +7,369 @@ Advanced version with better error handling, retry logic, and multiple fallback
 import re
 import json
 import asyncio
+import codecs
 import aiohttp
-import requests
 import random
+import ssl
 import time
-from typing import Dict, List, Optional, Union, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Union, Tuple
 from urllib.parse import urlparse, parse_qs, quote
 from bs4 import BeautifulSoup
+from html import unescape
 import logging
-from config import Config
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # fall back to BeautifulSoup on top of lxml
+    LexborHTMLParser = None
+try:
+    from orjson import loads as json_loads
+except ImportError:  # the stdlib parser accepts bytes too
+    json_loads = json.loads
+from yarl import URL
+from config import config, next_user_agent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pre-compiled patterns used on every request
+_ASIN_RE = re.compile(r'^[A-Z0-9]{10}$')
+_ASIN_URL_PATTERNS = (
+    r'/dp/([A-Z0-9]{10})',
+    r'/gp/product/([A-Z0-9]{10})',
+    r'/ASIN/([A-Z0-9]{10})',
+    r'/product/([A-Z0-9]{10})',
+    r'/d/([A-Z0-9]{10})',
+    r'asin=([A-Z0-9]{10})',
+    r'/([A-Z0-9]{10})(?:[/?]|$)'
+)
+# One anchored alternation; each branch is exhausted before the next is tried,
+# so earlier patterns keep their priority over later ones
+_ASIN_ANY_RE = re.compile(
+    '|'.join(f'.*?{pattern}' for pattern in _ASIN_URL_PATTERNS), re.IGNORECASE | re.DOTALL
+)
+_WS_RE = re.compile(r'\s+')
+
+# Regex fallbacks used by the enhanced parser, in priority order
+_TITLE_RES = tuple(re.compile(pattern, re.DOTALL | re.IGNORECASE) for pattern in (
+    r'<span[^>]*id="productTitle"[^>]*>(.*?)</span>',
+    r'<h1[^>]*id="title"[^>]*>(.*?)</h1>',
+    r'<title[^>]*>(.*?)</title>'
+))
+_DESC_RES = tuple(re.compile(pattern, re.DOTALL | re.IGNORECASE) for pattern in (
+    r'<div[^>]*id="feature-bullets"[^>]*>(.*?)</div>',
+    r'<div[^>]*id="productDescription"[^>]*>(.*?)</div>',
+    r'<div[^>]*class="[^"]*a-expander-content[^"]*"[^>]*>(.*?)</div>',
+    r'<div[^>]*class="[^"]*a-section[^"]*"[^>]*>.*?About this item.*?(.*?)</div>',
+    r'<span[^>]*class="[^"]*a-list-item[^"]*"[^>]*>(.*?)</span>',
+    r'<div[^>]*class="[^"]*a-spacing-base[^"]*"[^>]*>(.*?)</div>'
+))
+_IMG_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'data-old-hires="([^"]+)"',
+    r'data-a-dynamic-image="([^"]+)"',
+    r'src="([^"]*amazon[^"]*\.(?:jpg|jpeg|png|webp)[^"]*)"'
+))
+# Image URLs inside a data-a-dynamic-image JSON blob
+_JSON_IMG_URL_RE = re.compile(r'"([^"]*amazon[^"]*\.(?:jpg|jpeg|png|webp)[^"]*)"')
+
+# How much of a product page to parse before falling back to the whole document
+_HTML_PREFIX_CHARS = 512 * 1024
+
+# Markup that real product pages carry, and text that only error/captcha pages do
+_PRODUCT_INDICATORS = (
+    'productTitle',
+    'feature-bullets',
+    'productDescription',
+    'a-price',
+    'a-offscreen',
+    'data-old-hires',
+    'data-a-dynamic-image'
+)
+_ERROR_INDICATORS = tuple(indicator.lower() for indicator in (
+    "Sorry, we just need to make sure you're not a robot",
+    'Enter the characters you see below',
+    'Type the characters you see in this image',
+    'To discuss automated access to Amazon data please contact',
+    'Robot Check',
+    'captcha',
+    'blocked'
+))
+
+# Supported Amazon storefronts, and the currency expected on each
+_AMAZON_DOMAINS = frozenset({
+    'amazon.com', 'amazon.in', 'amazon.co.uk', 'amazon.ca', 'amazon.de', 'amazon.fr',
+    'amazon.it', 'amazon.es', 'amazon.com.au', 'amazon.com.br', 'amazon.co.jp'
+})
+_DOMAIN_CURRENCY = {
+    'amazon.in': 'INR',
+    'amazon.com': 'USD',
+    'amazon.co.uk': 'GBP',
+    'amazon.de': 'EUR',
+    'amazon.ca': 'CAD',
+    'amazon.com.au': 'AUD'
+}
+# Display symbol for each currency code a price can be reported in
+_CURRENCY_SYMBOLS = {
+    'INR': '₹',
+    'USD': '$',
+    'GBP': '£',
+    'EUR': '€',
+    'CAD': 'C$',
+    'AUD': 'A$'
+}
+# Currencies recognised from the text around an unlabelled price, in order of precedence
+_CONTEXT_CURRENCIES = ('INR', 'USD', 'GBP', 'EUR')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Heading text that Amazon puts in front of the description ("About this item", "Features:", ...)
+_DESC_PREFIX_RE = re.compile(
+    r'^(?:\s*(?:(?:about this item|product description|description)\s*:?|features\s*:))+\s*',
+    re.IGNORECASE
+)
+
+
+def _price_patterns(*specs: Tuple[str, str, str]) -> Tuple[Tuple[re.Pattern, str, str], ...]:
+    """Compile (pattern, symbol, currency code) specs, keeping their order"""
+    return tuple((re.compile(pattern, re.IGNORECASE), symbol, code) for pattern, symbol, code in specs)
+
+
+# Price patterns - ORDER MATTERS!
+_INR_PRICE_PATTERNS = _price_patterns(
+    # Indian Rupees
+    (r'₹(\d+(?:,\d+)*)', '₹', 'INR'),
+    (r'Rs\.?\s*(\d+(?:,\d+)*)', '₹', 'INR'),
+    (r'INR\s*(\d+(?:,\d+)*)', '₹', 'INR'),
+)
+_OTHER_PRICE_PATTERNS = _price_patterns(
+    # British Pounds - put first to avoid INR conflicts
+    (r'£(\d+(?:\.\d{2})?)', '£', 'GBP'),
+    (r'GBP\s*(\d+(?:\.\d{2})?)', '£', 'GBP'),
+    
+    # US Dollars
+    (r'\$(\d+(?:\.\d{2})?)', '$', 'USD'),
+    (r'USD\s*(\d+(?:\.\d{2})?)', '$', 'USD'),
+    
+    # Euro
+    (r'€(\d+(?:\.\d{2})?)', '€', 'EUR'),
+    (r'EUR\s*(\d+(?:\.\d{2})?)', '€', 'EUR'),
+    
+    # Canadian Dollars
+    (r'C\$\s*(\d+(?:\.\d{2})?)', 'C$', 'CAD'),
+    (r'CAD\s*(\d+(?:\.\d{2})?)', 'C$', 'CAD'),
+    
+    # Australian Dollars
+    (r'A\$\s*(\d+(?:\.\d{2})?)', 'A$', 'AUD'),
+    (r'AUD\s*(\d+(?:\.\d{2})?)', 'A$', 'AUD'),
+)
+# Generic price patterns - only used if no specific currency is found
+_GENERIC_PRICE_PATTERNS = _price_patterns(
+    (r'<span[^>]*class="[^"]*a-price-whole[^"]*"[^>]*>(\d+(?:,\d+)*)</span>', '', ''),
+    (r'<span[^>]*class="[^"]*a-offscreen[^"]*"[^>]*>([^<]+)</span>', '', ''),
+)
+# Currency patterns scanned together; India domains rank INR first, others rank it last
+_CURRENCY_PRICE_PATTERNS = _OTHER_PRICE_PATTERNS + _INR_PRICE_PATTERNS
+_PRICE_PRIORITY_OTHER = tuple(range(len(_CURRENCY_PRICE_PATTERNS)))
+_PRICE_PRIORITY_INR = (_PRICE_PRIORITY_OTHER[len(_OTHER_PRICE_PATTERNS):]
+                       + _PRICE_PRIORITY_OTHER[:len(_OTHER_PRICE_PATTERNS)])
+# Each pattern sits in a zero-width lookahead, so overlapping hits (e.g. "$45" inside
+# "C$45") are all reported; pattern i is captured by group 2i+1, its price by 2i+2
+_CURRENCY_PRICE_SCANNER = re.compile(
+    '|'.join(f'(?=({pattern.pattern}))' for pattern, _, _ in _CURRENCY_PRICE_PATTERNS),
+    re.IGNORECASE
+)
+# Lenient bare-number pattern for blocked pages
+_BARE_PRICE_RE = re.compile(r'(\d{2,4}(?:,\d{3})*(?:\.\d{2})?)')
+# Everything except digits and separators, stripped before validating a price
+_NON_PRICE_CHARS_RE = re.compile(r'[^\d.,]')
+
+
+def _strip_tags(text: str) -> str:
+    """Remove HTML tags, skipping the regex when the text has none"""
+    return _HTML_TAG_RE.sub('', text) if '<' in text else text
+
+
+def _unescape_basic(text: str) -> str:
+    """Decode the apostrophe and ampersand entities Amazon leaves in titles"""
+    if '&' not in text:
+        return text
+    return text.replace('&#39;', "'").replace('&amp;', '&')
+
+
+def _response_encoding(response: aiohttp.ClientResponse) -> str:
+    """Declared charset of a response if Python knows it, UTF-8 otherwise"""
+    if response.charset:
+        try:
+            return codecs.lookup(response.charset).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def _scan_prices(html: str, priority: Tuple[int, ...], is_valid: Callable[[str], bool],
+                 first_only: bool) -> Optional[Tuple[str, str, str]]:
+    """
+    Find the highest-priority currency pattern with a valid price in a single pass over html.
+    
+    Gives the same answer as trying each of _CURRENCY_PRICE_PATTERNS in priority order:
+    with first_only only a pattern's first occurrence counts (like re.search), otherwise
+    any occurrence does (like re.findall). Returns (price, symbol, currency code).
+    """
+    found: Dict[int, Optional[str]] = {}  # pattern index -> valid price, None if ruled out
+    for match in _CURRENCY_PRICE_SCANNER.finditer(html):
+        index = match.lastindex // 2
+        if index in found:
+            continue
+        price_value = match.group(match.lastindex + 1)
+        if is_valid(price_value):
+            found[index] = price_value
+        elif first_only:
+            found[index] = None
+        else:
+            continue
+        
+        # Stop as soon as every pattern ranked above a valid price is settled
+        for i in priority:
+            if i not in found:
+                break
+            if found[i] is not None:
+                _, symbol, currency_code = _CURRENCY_PRICE_PATTERNS[i]
+                return found[i], symbol, currency_code
+    
+    for i in priority:
+        if found.get(i):
+            _, symbol, currency_code = _CURRENCY_PRICE_PATTERNS[i]
+            return found[i], symbol, currency_code
+    return None
+
+class _SoupNode:
+    """selectolax-style view of a BeautifulSoup tag"""
+    
+    def __init__(self, tag):
+        self._tag = tag
+        self.attributes = tag.attrs
+    
+    def text(self) -> str:
+        return self._tag.get_text()
+
+
+class _SoupTree:
+    """selectolax-style wrapper around BeautifulSoup, used when selectolax is not installed"""
+    
+    def __init__(self, html: str):
+        self._soup = BeautifulSoup(html, 'lxml')
+    
+    def css_first(self, selector: str) -> Optional[_SoupNode]:
+        tag = self._soup.select_one(selector)
+        return _SoupNode(tag) if tag else None
+    
+    def css(self, selector: str) -> List[_SoupNode]:
+        return [_SoupNode(tag) for tag in self._soup.select(selector)]
+
+
+# Parse with lexbor's C parser when available
+_parse_html = LexborHTMLParser or _SoupTree
+
+
 class EnhancedAmazonProductAgent:
     """Enhanced Amazon Product Data Agent with multiple fallback methods"""
     
+    # Fetch methods, in fallback order
+    FETCH_METHODS = ('rainforest_api', 'scraperapi', 'rapidapi', 'direct_amazon')
+    
     def __init__(self):
         """Initialize the Enhanced Amazon Product Agent"""
-        self.config = Config()
-        
-        # Enhanced user agents to better mimic real browsers
-        self.config.USER_AGENTS = [
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        ]
-        
-        # Enhanced headers to better mimic real browser requests
-        self.config.HEADERS = {
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0'
+        self.config = config
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # SSL context to handle certificate issues, built once and reused by every connector
+        self._ssl_ctx = ssl.create_default_context()
+        self._ssl_ctx.check_hostname = False
+        self._ssl_ctx.verify_mode = ssl.CERT_NONE
+        
+        # Successful lookups keyed by (asin, domain) -> (expiry, (method name, product data))
+        self._result_cache: Dict[Tuple[str, str], Tuple[float, Tuple[str, Dict]]] = {}
+        # Lookups in progress, so concurrent requests for the same product share one
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        
+        # Per-storefront throttling state for direct page fetches
+        self._domain_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._domain_next_slot: Dict[str, float] = {}
+        
+        # One ready-made browser header set per user agent for direct page fetches
+        self._header_variants: Dict[str, Dict[str, str]] = {
+            user_agent: {
+                'User-Agent': user_agent,
+                **self.config.HEADERS,
+                'Referer': 'https://www.google.com/',
+                'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+                'sec-ch-ua-mobile': '?0',
+                'sec-ch-ua-platform': '"macOS"'
+            }
+            for user_agent in self.config.USER_AGENTS
         }
     
-    def extract_asin(self, input_data: str) -> Optional[str]:
+    async def __aenter__(self) -> "EnhancedAmazonProductAgent":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=self._ssl_ctx,
+                limit=self.config.POOL_LIMIT,
+                limit_per_host=self.config.POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=self.config.DNS_CACHE_TTL,
+                keepalive_timeout=self.config.KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP session"""
+        for lookup in list(self._inflight.values()):
+            lookup.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def extract_asin(input_data: str) -> Optional[str]:
         """Extract ASIN from Amazon URL or return ASIN if already provided"""
         # Clean input
         input_data = input_data.strip()
         
         # If it's already an ASIN (10 characters, alphanumeric)
-        if re.match(r'^[A-Z0-9]{10}$', input_data.upper()):
+        if _ASIN_RE.match(input_data.upper()):
             return input_data.upper()
         
         # Extract ASIN from URL patterns (including Indian Amazon)
-        asin_patterns = [
-            r'/dp/([A-Z0-9]{10})',
-            r'/gp/product/([A-Z0-9]{10})',
-            r'/ASIN/([A-Z0-9]{10})',
-            r'/product/([A-Z0-9]{10})',
-            r'/d/([A-Z0-9]{10})',
-            r'asin=([A-Z0-9]{10})',
-            r'/([A-Z0-9]{10})(?:[/?]|$)'
-        ]
-        
-        for pattern in asin_patterns:
-            match = re.search(pattern, input_data, re.IGNORECASE)
-            if match:
-                return match.group(1).upper()
+        match = _ASIN_ANY_RE.match(input_data)
+        return match.group(match.lastindex).upper() if match else None
+    
+    def _match_amazon_domain(self, input_data: str) -> Optional[str]:
+        """Return the Amazon storefront a URL points at, or None if it is not one"""
+        if not input_data:
+            return None
+        try:
+            parsed = urlparse(input_data.strip())
+            host = parsed.hostname or urlparse('//' + parsed.path).hostname or ''
+        except ValueError:  # e.g. an unbalanced '[' reads as an invalid IPv6 host
+            return None
         
+        # Walk up the subdomains: www.amazon.co.uk -> amazon.co.uk
+        while host:
+            if host in _AMAZON_DOMAINS:
+                return host
+            host = host.partition('.')[2]
         return None
     
     def get_amazon_domain(self, input_data: str) -> str:
         """Extract Amazon domain from URL"""
-        if 'amazon.in' in input_data:
-            return 'amazon.in'
-        elif 'amazon.co.uk' in input_data:
-            return 'amazon.co.uk'
-        elif 'amazon.ca' in input_data:
-            return 'amazon.ca'
-        elif 'amazon.de' in input_data:
-            return 'amazon.de'
-        elif 'amazon.fr' in input_data:
-            return 'amazon.fr'
-        elif 'amazon.it' in input_data:
-            return 'amazon.it'
-        elif 'amazon.es' in input_data:
-            return 'amazon.es'
-        elif 'amazon.com.au' in input_data:
-            return 'amazon.com.au'
-        elif 'amazon.com.br' in input_data:
-            return 'amazon.com.br'
-        elif 'amazon.co.jp' in input_data:
-            return 'amazon.co.jp'
-        else:
-            return 'amazon.com'  # Default to US Amazon
+        return self._match_amazon_domain(input_data) or 'amazon.com'  # Default to US Amazon
     
     def _clean_description(self, description: str) -> str:
         """Clean and format product description"""
@@ -110,90 +377,67 @@ class EnhancedAmazonProductAgent:
             return ""
         
         # Remove common prefixes
-        prefixes_to_remove = [
-            "About this item",
-            "About this Item",
-            "ABOUT THIS ITEM",
-            "Product Description",
-            "Description",
-            "Features:",
-            "Features :",
-            "FEATURES:",
-            "FEATURES :"
-        ]
+        description = _DESC_PREFIX_RE.sub('', description, count=1)
         
-        for prefix in prefixes_to_remove:
-            if description.startswith(prefix):
-                description = description[len(prefix):].strip()
+        # Decode HTML entities and remove any remaining HTML tags
+        description = _strip_tags(unescape(description))
         
         # Remove extra whitespace and normalize
-        description = re.sub(r'\s+', ' ', description)
-        description = description.strip()
-        
-        # Remove HTML entities
-        description = description.replace('&amp;', '&')
-        description = description.replace('&quot;', '"')
-        description = description.replace('&#39;', "'")
-        description = description.replace('&lt;', '<')
-        description = description.replace('&gt;', '>')
-        description = description.replace('&nbsp;', ' ')
-        
-        # Remove any remaining HTML tags
-        description = re.sub(r'<[^>]+>', '', description)
-        
-        # Clean up multiple spaces again
-        description = re.sub(r'\s+', ' ', description)
-        description = description.strip()
+        description = _WS_RE.sub(' ', description).strip()
         
         return description
     
-    async def _make_request_with_retry(self, session: aiohttp.ClientSession, 
-                                     url: str, params: Optional[Dict] = None, 
-                                     headers: Optional[Dict] = None) -> Optional[Tuple[int, str]]:
-        """Make HTTP request with retry logic"""
-        # SSL context to handle certificate issues
-        import ssl
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
+    async def _make_request_with_retry(self, url: Union[str, URL], params: Optional[Dict] = None, 
+                                     headers: Optional[Dict] = None,
+                                     as_bytes: bool = False) -> Optional[Tuple[int, Union[str, bytes]]]:
+        """Make HTTP request with retry logic, returning the body as text or raw bytes"""
+        session = await self._get_session()
         
         for attempt in range(self.config.MAX_RETRIES):
+            last_attempt = attempt == self.config.MAX_RETRIES - 1
             try:
-                async with aiohttp.ClientSession(connector=connector) as temp_session:
-                    async with temp_session.get(
-                        url,
-                        params=params,
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=self.config.REQUEST_TIMEOUT)
-                    ) as response:
-                        content = await response.text()
+                async with session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=self.config.CLIENT_TIMEOUT
+                ) as response:
+                    # Server errors are worth another try; anything else is final
+                    if response.status >= 500 and not last_attempt:
+                        logger.warning(f"Request attempt {attempt + 1} got status {response.status}")
+                    else:
+                        if as_bytes:
+                            content = await response.read()
+                        else:
+                            # Trust the declared charset (UTF-8 otherwise) rather than sniffing the body
+                            content = await response.text(encoding=_response_encoding(response), errors='replace')
                         return response.status, content
-            except Exception as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 logger.warning(f"Request attempt {attempt + 1} failed: {e}")
-                if attempt < self.config.MAX_RETRIES - 1:
-                    await asyncio.sleep(self.config.RETRY_DELAY * (attempt + 1))
-                else:
+                if last_attempt:
                     logger.error(f"All request attempts failed for {url}")
                     return None
+            except Exception as e:
+                logger.error(f"Request to {url} failed: {e}")
+                return None
+            
+            # Exponential backoff before the next attempt
+            await asyncio.sleep(self.config.RETRY_DELAY * 2 ** attempt)
     
     async def fetch_with_rainforest_api(self, asin: str) -> Optional[Dict]:
         """Fetch product data using Rainforest API"""
         try:
-            params = self.apis['rainforest']['params'].copy()
-            params['asin'] = asin
-            
-            async with aiohttp.ClientSession() as session:
-                result = await self._make_request_with_retry(session, self.apis['rainforest']['url'], params)
-                if result:
-                    status, content = result
-                    if status == 200:
-                        data = json.loads(content)
-                        return self._parse_rainforest_response(data)
-                    else:
-                        logger.warning(f"Rainforest API failed with status {status}")
-                return None
+            params = dict(self.config.RAINFOREST_PARAMS, asin=asin)
+            
+            result = await self._make_request_with_retry(self.config.RAINFOREST_ENDPOINT, params, as_bytes=True)
+            if result:
+                status, content = result
+                if status == 200:
+                    data = json_loads(content)
+                    return self._parse_rainforest_response(data)
+                else:
+                    logger.warning(f"Rainforest API failed with status {status}")
+            return None
         except Exception as e:
             logger.error(f"Rainforest API error: {e}")
             return None
@@ -201,18 +445,16 @@ class EnhancedAmazonProductAgent:
     async def fetch_with_scraperapi(self, asin: str) -> Optional[Dict]:
         """Fetch product data using ScraperAPI"""
         try:
-            params = self.apis['scraperapi']['params'].copy()
-            params['url'] = f'https://www.amazon.com/dp/{asin}'
+            params = dict(self.config.SCRAPERAPI_PARAMS, url=f'https://www.amazon.com/dp/{asin}')
             
-            async with aiohttp.ClientSession() as session:
-                result = await self._make_request_with_retry(session, self.apis['scraperapi']['url'], params)
-                if result:
-                    status, content = result
-                    if status == 200:
-                        return self._parse_amazon_html(content, asin)
-                    else:
-                        logger.warning(f"ScraperAPI failed with status {status}")
-                return None
+            result = await self._make_request_with_retry(self.config.SCRAPERAPI_ENDPOINT, params)
+            if result:
+                status, content = result
+                if status == 200:
+                    return self._parse_amazon_html(content, asin)
+                else:
+                    logger.warning(f"ScraperAPI failed with status {status}")
+            return None
         except Exception as e:
             logger.error(f"ScraperAPI error: {e}")
             return None
@@ -220,67 +462,61 @@ class EnhancedAmazonProductAgent:
     async def fetch_with_rapidapi(self, asin: str) -> Optional[Dict]:
         """Fetch product data using RapidAPI"""
         try:
-            headers = self.apis['rapidapi']['headers'].copy()
+            # Read-only mapping; aiohttp copies it into its own header multidict
+            headers = self.config.RAPIDAPI_HEADERS
             params = {'keyword': asin, 'country': 'US', 'category': 'aps'}
             
-            async with aiohttp.ClientSession() as session:
-                result = await self._make_request_with_retry(
-                    session, self.apis['rapidapi']['url'], params, headers
-                )
-                if result:
-                    status, content = result
-                    if status == 200:
-                        data = json.loads(content)
-                        return self._parse_rapidapi_response(data)
-                    else:
-                        logger.warning(f"RapidAPI failed with status {status}")
-                return None
+            result = await self._make_request_with_retry(
+                self.config.RAPIDAPI_ENDPOINT, params, headers, as_bytes=True
+            )
+            if result:
+                status, content = result
+                if status == 200:
+                    data = json_loads(content)
+                    return self._parse_rapidapi_response(data)
+                else:
+                    logger.warning(f"RapidAPI failed with status {status}")
+            return None
         except Exception as e:
             logger.error(f"RapidAPI error: {e}")
             return None
     
+    def _domain_semaphore(self, domain: str) -> asyncio.Semaphore:
+        """Return the semaphore capping concurrent direct fetches to one storefront"""
+        semaphore = self._domain_semaphores.get(domain)
+        if semaphore is None:
+            semaphore = self._domain_semaphores[domain] = asyncio.Semaphore(self.config.DIRECT_CONCURRENCY)
+        return semaphore
+    
+    async def _pace_domain(self, domain: str) -> None:
+        """Space out request starts to one storefront by a small jittered interval"""
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._domain_next_slot.get(domain, 0.0))
+        self._domain_next_slot[domain] = slot + random.uniform(*self.config.DIRECT_REQUEST_SPACING)
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
     async def fetch_with_direct_amazon(self, asin: str, original_url: Optional[str] = None) -> Optional[Dict]:
         """Direct Amazon page fetch (fallback method)"""
         try:
             # Use the original domain if available, otherwise default to amazon.com
-            if original_url:
-                domain = self.get_amazon_domain(original_url)
-                url = f'https://www.{domain}/dp/{asin}'
-            else:
-                url = f'https://www.amazon.com/dp/{asin}'
-            
-            # Enhanced headers to better mimic real browser
-            headers = {
-                'User-Agent': random.choice(self.config.USER_AGENTS),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1',
-                'Cache-Control': 'max-age=0',
-                'Referer': 'https://www.google.com/',
-                'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"macOS"'
-            }
-            
-            # Add a small delay to avoid rate limiting
-            await asyncio.sleep(random.uniform(1, 3))
-            
-            async with aiohttp.ClientSession() as session:
-                result = await self._make_request_with_retry(session, url, headers=headers)
-                if result:
-                    status, content = result
-                    if status == 200:
-                        return self._parse_amazon_html_enhanced(content, asin, original_url)
-                    else:
-                        logger.warning(f"Direct Amazon fetch failed with status {status}")
-                return None
+            domain = self.get_amazon_domain(original_url) if original_url else 'amazon.com'
+            url = f'https://www.{domain}/dp/{asin}'
+            
+            # Enhanced headers to better mimic real browser, prebuilt per user agent
+            headers = self._header_variants[next_user_agent()]
+            
+            # Throttle per storefront to avoid rate limiting
+            async with self._domain_semaphore(domain):
+                await self._pace_domain(domain)
+                result = await self._make_request_with_retry(url, headers=headers)
+            if result:
+                status, content = result
+                if status == 200:
+                    return self._parse_amazon_html_enhanced(content, asin, original_url)
+                else:
+                    logger.warning(f"Direct Amazon fetch failed with status {status}")
+            return None
         except Exception as e:
             logger.error(f"Direct Amazon fetch error: {e}")
             return None
@@ -332,104 +568,102 @@ class EnhancedAmazonProductAgent:
     def _parse_amazon_html(self, html: str, asin: str) -> Optional[Dict]:
         """Parse Amazon HTML page (basic method)"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract product name
-            title_selectors = [
-                'span#productTitle',
-                'h1#title',
-                'h1.a-size-large',
-                '[data-automation-id="product-title"]'
-            ]
-            
-            product_name = ''
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    product_name = title_elem.get_text().strip()
-                    break
-            
-            # Extract price
-            price_selectors = [
-                'span.a-price-whole',
-                'span.a-price.a-text-price span.a-offscreen',
-                'span.a-price.a-text-price',
-                '.a-price .a-offscreen'
-            ]
-            
-            price = ''
-            for selector in price_selectors:
-                price_elem = soup.select_one(selector)
-                if price_elem:
-                    price = price_elem.get_text().strip()
-                    break
-            
-            # Extract description
-            desc_selectors = [
-                '#feature-bullets',
-                '#productDescription',
-                '.a-expander-content',
-                '.a-section.a-spacing-base',
-                '[data-automation-id="feature-bullets"]'
-            ]
-            
-            description = ''
-            for selector in desc_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    description = desc_elem.get_text().strip()
-                    # Clean up the description
-                    description = self._clean_description(description)
-                    if description and len(description) > 20:  # Ensure we have meaningful content
-                        break
-            
-            # Extract images
-            img_selectors = [
-                'img[data-old-hires]',
-                'img[data-a-dynamic-image]',
-                '.a-dynamic-image'
-            ]
-            
-            image_urls = []
-            for selector in img_selectors:
-                img_elements = soup.select(selector)
-                for img in img_elements:
-                    img_url = img.get('data-old-hires') or img.get('src')
-                    if img_url and img_url not in image_urls:
-                        image_urls.append(img_url)
-            
-            return {
-                "product_name": product_name,
-                "price": {
-                    "original": price,
-                    "discounted": price
-                },
-                "description": description,
-                "variants": [],
-                "image_urls": image_urls[:5]  # Limit to 5 images
-            }
+            # The product section sits near the top of the page, so try parsing just the
+            # head of the document and fall back to the full page if anything is missing
+            if len(html) > _HTML_PREFIX_CHARS:
+                result = self._parse_amazon_tree(_parse_html(html[:_HTML_PREFIX_CHARS]))
+                if result['product_name'] and result['price']['original'] and result['description']:
+                    return result
+            return self._parse_amazon_tree(_parse_html(html))
         except Exception as e:
             logger.error(f"Error parsing Amazon HTML: {e}")
             return None
     
+    def _parse_amazon_tree(self, tree) -> Dict:
+        """Extract product fields from a parsed Amazon page"""
+        # Extract product name
+        title_selectors = [
+            'span#productTitle',
+            'h1#title',
+            'h1.a-size-large',
+            '[data-automation-id="product-title"]'
+        ]
+        
+        product_name = ''
+        for selector in title_selectors:
+            title_elem = tree.css_first(selector)
+            if title_elem:
+                product_name = title_elem.text().strip()
+                break
+        
+        # Extract price
+        price_selectors = [
+            'span.a-price-whole',
+            'span.a-price.a-text-price span.a-offscreen',
+            'span.a-price.a-text-price',
+            '.a-price .a-offscreen'
+        ]
+        
+        price = ''
+        for selector in price_selectors:
+            price_elem = tree.css_first(selector)
+            if price_elem:
+                price = price_elem.text().strip()
+                break
+        
+        # Extract description
+        desc_selectors = [
+            '#feature-bullets',
+            '#productDescription',
+            '.a-expander-content',
+            '.a-section.a-spacing-base',
+            '[data-automation-id="feature-bullets"]'
+        ]
+        
+        description = ''
+        for selector in desc_selectors:
+            desc_elem = tree.css_first(selector)
+            if desc_elem:
+                description = desc_elem.text().strip()
+                # Clean up the description
+                description = self._clean_description(description)
+                if description and len(description) > 20:  # Ensure we have meaningful content
+                    break
+        
+        # Extract images
+        img_selectors = [
+            'img[data-old-hires]',
+            'img[data-a-dynamic-image]',
+            '.a-dynamic-image'
+        ]
+        
+        image_urls = []
+        seen_urls = set()
+        for selector in img_selectors:
+            img_elements = tree.css(selector)
+            for img in img_elements:
+                img_url = img.attributes.get('data-old-hires') or img.attributes.get('src')
+                if img_url and img_url not in seen_urls:
+                    seen_urls.add(img_url)
+                    image_urls.append(img_url)
+        
+        return {
+            "product_name": product_name,
+            "price": {
+                "original": price,
+                "discounted": price
+            },
+            "description": description,
+            "variants": [],
+            "image_urls": image_urls[:5]  # Limit to 5 images
+        }
+    
     def _extract_price_with_currency(self, html: str, original_url: str = "") -> Dict[str, str]:
         """Extract price with currency detection based on domain and HTML content"""
         price_data = {"original": "", "discounted": "", "currency": ""}
         
         # First, determine the expected currency based on the original URL domain
-        expected_currency = ""
-        if "amazon.in" in original_url:
-            expected_currency = "INR"
-        elif "amazon.com" in original_url:
-            expected_currency = "USD"
-        elif "amazon.co.uk" in original_url:
-            expected_currency = "GBP"
-        elif "amazon.de" in original_url:
-            expected_currency = "EUR"
-        elif "amazon.ca" in original_url:
-            expected_currency = "CAD"
-        elif "amazon.com.au" in original_url:
-            expected_currency = "AUD"
+        expected_currency = _DOMAIN_CURRENCY.get(self._match_amazon_domain(original_url), "")
         
         # Check if we have real product data (not an error page)
         if not self._has_real_product_data(html):
@@ -443,143 +677,44 @@ class EnhancedAmazonProductAgent:
         # Enhanced price extraction with currency detection - ORDER MATTERS!
         # For India domains, prioritize INR patterns first
         if expected_currency == "INR":
-            price_patterns = [
-                # Indian Rupees - put first for India domains
-                (r'₹(\d+(?:,\d+)*)', '₹', 'INR'),
-                (r'Rs\.?\s*(\d+(?:,\d+)*)', '₹', 'INR'),
-                (r'INR\s*(\d+(?:,\d+)*)', '₹', 'INR'),
-                
-                # British Pounds
-                (r'£(\d+(?:\.\d{2})?)', '£', 'GBP'),
-                (r'GBP\s*(\d+(?:\.\d{2})?)', '£', 'GBP'),
-                
-                # US Dollars
-                (r'\$(\d+(?:\.\d{2})?)', '$', 'USD'),
-                (r'USD\s*(\d+(?:\.\d{2})?)', '$', 'USD'),
-                
-                # Euro
-                (r'€(\d+(?:\.\d{2})?)', '€', 'EUR'),
-                (r'EUR\s*(\d+(?:\.\d{2})?)', '€', 'EUR'),
-                
-                # Canadian Dollars
-                (r'C\$\s*(\d+(?:\.\d{2})?)', 'C$', 'CAD'),
-                (r'CAD\s*(\d+(?:\.\d{2})?)', 'C$', 'CAD'),
-                
-                # Australian Dollars
-                (r'A\$\s*(\d+(?:\.\d{2})?)', 'A$', 'AUD'),
-                (r'AUD\s*(\d+(?:\.\d{2})?)', 'A$', 'AUD'),
-                
-                # Generic price patterns - LAST, and only if no specific currency found
-                # Make these more specific to avoid false matches
-                (r'<span[^>]*class="[^"]*a-price-whole[^"]*"[^>]*>(\d+(?:,\d+)*)</span>', '', ''),
-                (r'<span[^>]*class="[^"]*a-offscreen[^"]*"[^>]*>([^<]+)</span>', '', ''),
-            ]
+            priority = _PRICE_PRIORITY_INR
         else:
-            # For non-India domains, use standard order
-            price_patterns = [
-                # British Pounds - put first to avoid INR conflicts
-                (r'£(\d+(?:\.\d{2})?)', '£', 'GBP'),
-                (r'GBP\s*(\d+(?:\.\d{2})?)', '£', 'GBP'),
-                
-                # US Dollars
-                (r'\$(\d+(?:\.\d{2})?)', '$', 'USD'),
-                (r'USD\s*(\d+(?:\.\d{2})?)', '$', 'USD'),
-                
-                # Euro
-                (r'€(\d+(?:\.\d{2})?)', '€', 'EUR'),
-                (r'EUR\s*(\d+(?:\.\d{2})?)', '€', 'EUR'),
-                
-                # Canadian Dollars
-                (r'C\$\s*(\d+(?:\.\d{2})?)', 'C$', 'CAD'),
-                (r'CAD\s*(\d+(?:\.\d{2})?)', 'C$', 'CAD'),
-                
-                # Australian Dollars
-                (r'A\$\s*(\d+(?:\.\d{2})?)', 'A$', 'AUD'),
-                (r'AUD\s*(\d+(?:\.\d{2})?)', 'A$', 'AUD'),
-                
-                # Indian Rupees - put last for non-India domains
-                (r'₹(\d+(?:,\d+)*)', '₹', 'INR'),
-                (r'Rs\.?\s*(\d+(?:,\d+)*)', '₹', 'INR'),
-                (r'INR\s*(\d+(?:,\d+)*)', '₹', 'INR'),
-                
-                # Generic price patterns - LAST, and only if no specific currency found
-                # Make these more specific to avoid false matches
-                (r'<span[^>]*class="[^"]*a-price-whole[^"]*"[^>]*>(\d+(?:,\d+)*)</span>', '', ''),
-                (r'<span[^>]*class="[^"]*a-offscreen[^"]*"[^>]*>([^<]+)</span>', '', ''),
-            ]
-        
-        # First pass: look for specific currency patterns
-        for pattern, symbol, currency_code in price_patterns[:-2]:  # Skip generic patterns
-            match = re.search(pattern, html, re.IGNORECASE)
-            if match:
-                price_value = match.group(1)
-                # Validate that this looks like a real price (not just a number)
-                if self._is_valid_price(price_value):
-                    price_data["discounted"] = f"{symbol}{price_value}"
-                    price_data["original"] = f"{symbol}{price_value}"
-                    price_data["currency"] = currency_code
-                    return price_data  # Return immediately if specific currency found
+            priority = _PRICE_PRIORITY_OTHER
+        
+        # First pass: look for specific currency patterns, validating that the first
+        # match of each looks like a real price (not just a number)
+        found = _scan_prices(html, priority, self._is_valid_price, first_only=True)
+        if found:
+            price_value, symbol, currency_code = found
+            price_data["discounted"] = f"{symbol}{price_value}"
+            price_data["original"] = f"{symbol}{price_value}"
+            price_data["currency"] = currency_code
+            return price_data  # Return immediately if specific currency found
         
         # Second pass: if no specific currency found, use generic patterns with domain-based currency
-        for pattern, symbol, currency_code in price_patterns[-2:]:  # Only generic patterns
-            match = re.search(pattern, html, re.IGNORECASE)
+        for pattern, symbol, currency_code in _GENERIC_PRICE_PATTERNS:
+            match = pattern.search(html)
             if match:
                 price_value = match.group(1)
                 # Additional validation for generic patterns
                 if self._is_valid_price(price_value):
                     # Use the expected currency from domain - this is the key fix
                     if expected_currency:
-                        if expected_currency == "INR":
-                            price_data["discounted"] = f"₹{price_value}"
-                            price_data["original"] = f"₹{price_value}"
-                            price_data["currency"] = "INR"
-                        elif expected_currency == "USD":
-                            price_data["discounted"] = f"${price_value}"
-                            price_data["original"] = f"${price_value}"
-                            price_data["currency"] = "USD"
-                        elif expected_currency == "GBP":
-                            price_data["discounted"] = f"£{price_value}"
-                            price_data["original"] = f"£{price_value}"
-                            price_data["currency"] = "GBP"
-                        elif expected_currency == "EUR":
-                            price_data["discounted"] = f"€{price_value}"
-                            price_data["original"] = f"€{price_value}"
-                            price_data["currency"] = "EUR"
-                        elif expected_currency == "CAD":
-                            price_data["discounted"] = f"C${price_value}"
-                            price_data["original"] = f"C${price_value}"
-                            price_data["currency"] = "CAD"
-                        elif expected_currency == "AUD":
-                            price_data["discounted"] = f"A${price_value}"
-                            price_data["original"] = f"A${price_value}"
-                            price_data["currency"] = "AUD"
+                        currency_code = expected_currency
                     else:
-                        # Fallback: try to detect from HTML context
+                        # Fallback: try to detect from HTML context, defaulting to USD
                         context_start = max(0, match.start() - 100)
                         context_end = min(len(html), match.end() + 100)
                         context = html[context_start:context_end]
-                        
-                        if '₹' in context or 'INR' in context:
-                            price_data["currency"] = "INR"
-                            price_data["discounted"] = f"₹{price_value}"
-                            price_data["original"] = f"₹{price_value}"
-                        elif '$' in context or 'USD' in context:
-                            price_data["currency"] = "USD"
-                            price_data["discounted"] = f"${price_value}"
-                            price_data["original"] = f"${price_value}"
-                        elif '£' in context or 'GBP' in context:
-                            price_data["currency"] = "GBP"
-                            price_data["discounted"] = f"£{price_value}"
-                            price_data["original"] = f"£{price_value}"
-                        elif '€' in context or 'EUR' in context:
-                            price_data["currency"] = "EUR"
-                            price_data["discounted"] = f"€{price_value}"
-                            price_data["original"] = f"€{price_value}"
-                        else:
-                            # Default to USD if no currency detected
-                            price_data["currency"] = "USD"
-                            price_data["discounted"] = f"${price_value}"
-                            price_data["original"] = f"${price_value}"
+                        currency_code = next(
+                            (code for code in _CONTEXT_CURRENCIES
+                             if _CURRENCY_SYMBOLS[code] in context or code in context),
+                            "USD"
+                        )
+                    symbol = _CURRENCY_SYMBOLS[currency_code]
+                    price_data["discounted"] = f"{symbol}{price_value}"
+                    price_data["original"] = f"{symbol}{price_value}"
+                    price_data["currency"] = currency_code
                     
                     break
         
@@ -589,85 +724,40 @@ class EnhancedAmazonProductAgent:
         """Extract price from limited HTML content when Amazon blocks us"""
         price_data = {"original": "", "discounted": "", "currency": ""}
         
-        # Look for any price-like patterns in the HTML, even if it's limited
-        price_patterns = [
-            # Currency symbols with numbers - ORDER MATTERS!
-            # British Pounds - put first to avoid INR conflicts
-            (r'£(\d+(?:\.\d{2})?)', '£', 'GBP'),
-            (r'GBP\s*(\d+(?:\.\d{2})?)', '£', 'GBP'),
-            
-            # US Dollars
-            (r'\$(\d+(?:\.\d{2})?)', '$', 'USD'),
-            (r'USD\s*(\d+(?:\.\d{2})?)', '$', 'USD'),
-            
-            # Euro
-            (r'€(\d+(?:\.\d{2})?)', '€', 'EUR'),
-            (r'EUR\s*(\d+(?:\.\d{2})?)', '€', 'EUR'),
-            
-            # Canadian Dollars
-            (r'C\$\s*(\d+(?:\.\d{2})?)', 'C$', 'CAD'),
-            (r'CAD\s*(\d+(?:\.\d{2})?)', 'C$', 'CAD'),
-            
-            # Australian Dollars
-            (r'A\$\s*(\d+(?:\.\d{2})?)', 'A$', 'AUD'),
-            (r'AUD\s*(\d+(?:\.\d{2})?)', 'A$', 'AUD'),
-            
-            # Indian Rupees - put last to avoid conflicts
-            (r'₹(\d+(?:,\d+)*)', '₹', 'INR'),
-            (r'Rs\.?\s*(\d+(?:,\d+)*)', '₹', 'INR'),
-            (r'INR\s*(\d+(?:,\d+)*)', '₹', 'INR'),
-            
-            # Just numbers that might be prices (be more lenient)
-            (r'(\d{2,4}(?:,\d{3})*(?:\.\d{2})?)', '', ''),
-        ]
+        # Look for any price-like patterns in the HTML, even if it's limited,
+        # with more lenient validation for fallback
+        found = _scan_prices(html, _PRICE_PRIORITY_OTHER, self._is_valid_fallback_price, first_only=False)
+        if found:  # If we found a specific currency
+            price_value, symbol, currency_code = found
+            price_data["discounted"] = f"{symbol}{price_value}"
+            price_data["original"] = f"{symbol}{price_value}"
+            price_data["currency"] = currency_code
+            return price_data
         
-        for pattern, symbol, currency_code in price_patterns:
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            for match in matches:
-                price_value = match
-                # More lenient validation for fallback
+        # Just numbers that might be prices, priced in the expected currency from domain
+        if expected_currency:
+            for price_value in _BARE_PRICE_RE.findall(html):
                 if self._is_valid_fallback_price(price_value):
-                    if currency_code:  # If we found a specific currency
-                        price_data["discounted"] = f"{symbol}{price_value}"
-                        price_data["original"] = f"{symbol}{price_value}"
-                        price_data["currency"] = currency_code
-                        return price_data
-                    elif expected_currency:  # Use expected currency from domain
-                        if expected_currency == "INR":
-                            price_data["discounted"] = f"₹{price_value}"
-                            price_data["original"] = f"₹{price_value}"
-                            price_data["currency"] = "INR"
-                        elif expected_currency == "USD":
-                            price_data["discounted"] = f"${price_value}"
-                            price_data["original"] = f"${price_value}"
-                            price_data["currency"] = "USD"
-                        elif expected_currency == "GBP":
-                            price_data["discounted"] = f"£{price_value}"
-                            price_data["original"] = f"£{price_value}"
-                            price_data["currency"] = "GBP"
-                        elif expected_currency == "EUR":
-                            price_data["discounted"] = f"€{price_value}"
-                            price_data["original"] = f"€{price_value}"
-                            price_data["currency"] = "EUR"
-                        elif expected_currency == "CAD":
-                            price_data["discounted"] = f"C${price_value}"
-                            price_data["original"] = f"C${price_value}"
-                            price_data["currency"] = "CAD"
-                        elif expected_currency == "AUD":
-                            price_data["discounted"] = f"A${price_value}"
-                            price_data["original"] = f"A${price_value}"
-                            price_data["currency"] = "AUD"
-                        return price_data
+                    symbol = _CURRENCY_SYMBOLS[expected_currency]
+                    price_data["discounted"] = f"{symbol}{price_value}"
+                    price_data["original"] = f"{symbol}{price_value}"
+                    price_data["currency"] = expected_currency
+                    return price_data
         
         return price_data
     
     def _is_valid_fallback_price(self, price_value: str) -> bool:
         """More lenient validation for fallback price extraction"""
-        if not price_value:
+        return self._is_price_in_range(price_value, 0.01, 10000000)
+    
+    def _is_price_in_range(self, price_value: str, lowest: float, highest: float) -> bool:
+        """Check that a price string holds a number of at least two digits within [lowest, highest]"""
+        # Cleaning only ever removes characters, so a short value can be rejected up front
+        if not price_value or len(price_value) < 2:
             return False
         
         # Remove any non-digit characters except decimal and comma
-        clean_price = re.sub(r'[^\d.,]', '', price_value)
+        clean_price = _NON_PRICE_CHARS_RE.sub('', price_value)
         
         # Check if it's a reasonable price (not just a single digit)
         if len(clean_price) < 2:
@@ -677,150 +767,88 @@ class EnhancedAmazonProductAgent:
         try:
             # Remove commas and convert to float
             numeric_price = float(clean_price.replace(',', ''))
-            if numeric_price < 0.01 or numeric_price > 10000000:  # More lenient range
-                return False
         except ValueError:
             return False
-        
-        return True
+        return lowest <= numeric_price <= highest
     
     def _has_real_product_data(self, html: str) -> bool:
         """Check if the HTML contains real product data (not an error page)"""
-        # Look for indicators of real product pages
-        product_indicators = [
-            'productTitle',
-            'feature-bullets',
-            'productDescription',
-            'a-price',
-            'a-offscreen',
-            'data-old-hires',
-            'data-a-dynamic-image'
-        ]
-        
-        # Look for indicators of error pages
-        error_indicators = [
-            'Sorry, we just need to make sure you\'re not a robot',
-            'Enter the characters you see below',
-            'Type the characters you see in this image',
-            'To discuss automated access to Amazon data please contact',
-            'Robot Check',
-            'captcha',
-            'blocked'
-        ]
-        
-        # Check for error indicators first
-        for error_indicator in error_indicators:
-            if error_indicator.lower() in html.lower():
-                return False
+        # Check for error indicators first, lowercasing the page only once
+        lowered = html.lower()
+        if any(indicator in lowered for indicator in _ERROR_INDICATORS):
+            return False
         
         # Check for product indicators
-        product_count = 0
-        for indicator in product_indicators:
-            if indicator in html:
-                product_count += 1
+        product_count = sum(indicator in html for indicator in _PRODUCT_INDICATORS)
         
         # Need at least 2 product indicators to consider it real
         return product_count >= 2
     
     def _is_valid_price(self, price_value: str) -> bool:
         """Check if a price value looks like a real price"""
-        if not price_value:
-            return False
-        
-        # Remove any non-digit characters except decimal and comma
-        clean_price = re.sub(r'[^\d.,]', '', price_value)
-        
-        # Check if it's a reasonable price (not just a single digit or very small number)
-        if len(clean_price) < 2:
-            return False
-        
-        # Check if it starts with 0 (likely not a real price)
-        if clean_price.startswith('0') and len(clean_price) == 1:
-            return False
-        
-        # Check if it's a reasonable range (not too small, not too large)
-        try:
-            # Remove commas and convert to float
-            numeric_price = float(clean_price.replace(',', ''))
-            if numeric_price < 1 or numeric_price > 1000000:  # Reasonable price range
-                return False
-        except ValueError:
-            return False
-        
-        return True
-
+        return self._is_price_in_range(price_value, 1, 1000000)
+    
     def _parse_amazon_html_enhanced(self, html: str, asin: str, original_url: str = "") -> Optional[Dict]:
         """Enhanced Amazon HTML parsing with more selectors and currency detection"""
+        # Title, price and feature bullets sit near the top of the page, so scan just the
+        # head of large documents and only fall back to the whole page if anything is missing
+        if len(html) > _HTML_PREFIX_CHARS:
+            result = self._parse_amazon_html_fields(html[:_HTML_PREFIX_CHARS], original_url)
+            if result and result['product_name'] and result['price']['discounted'] and result['description']:
+                return result
+        return self._parse_amazon_html_fields(html, original_url)
+    
+    def _parse_amazon_html_fields(self, html: str, original_url: str = "") -> Optional[Dict]:
+        """Extract product fields from Amazon HTML with regexes"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
             # Enhanced product name extraction
-            title_patterns = [
-                r'<span[^>]*id="productTitle"[^>]*>(.*?)</span>',
-                r'<h1[^>]*id="title"[^>]*>(.*?)</h1>',
-                r'<title[^>]*>(.*?)</title>'
-            ]
-            
             product_name = ''
-            for pattern in title_patterns:
-                match = re.search(pattern, html, re.DOTALL | re.IGNORECASE)
+            for pattern in _TITLE_RES:
+                match = pattern.search(html)
                 if match:
-                    product_name = re.sub(r'<[^>]+>', '', match.group(1)).strip()
-                    # Clean HTML entities
-                    product_name = product_name.replace('&#39;', "'").replace('&amp;', '&')
+                    # Strip tags and clean HTML entities
+                    product_name = _unescape_basic(_strip_tags(match.group(1)).strip())
                     break
             
             # Extract price with currency detection
             price_data = self._extract_price_with_currency(html, original_url)
             
             # Enhanced description extraction with multiple patterns
-            desc_patterns = [
-                r'<div[^>]*id="feature-bullets"[^>]*>(.*?)</div>',
-                r'<div[^>]*id="productDescription"[^>]*>(.*?)</div>',
-                r'<div[^>]*class="[^"]*a-expander-content[^"]*"[^>]*>(.*?)</div>',
-                r'<div[^>]*class="[^"]*a-section[^"]*"[^>]*>.*?About this item.*?(.*?)</div>',
-                r'<span[^>]*class="[^"]*a-list-item[^"]*"[^>]*>(.*?)</span>',
-                r'<div[^>]*class="[^"]*a-spacing-base[^"]*"[^>]*>(.*?)</div>'
-            ]
-            
             description = ''
-            for pattern in desc_patterns:
-                match = re.search(pattern, html, re.DOTALL | re.IGNORECASE)
+            for pattern in _DESC_RES:
+                match = pattern.search(html)
                 if match:
-                    description = re.sub(r'<[^>]+>', '', match.group(1)).strip()
+                    description = _strip_tags(match.group(1)).strip()
                     # Clean up the description
                     description = self._clean_description(description)
                     if description and len(description) > 20:  # Ensure we have meaningful content
                         break
             
-            # Enhanced image extraction with better parsing
-            img_patterns = [
-                r'data-old-hires="([^"]+)"',
-                r'data-a-dynamic-image="([^"]+)"',
-                r'src="([^"]*amazon[^"]*\.(?:jpg|jpeg|png|webp)[^"]*)"'
-            ]
-            
-            image_urls = []
-            for pattern in img_patterns:
-                matches = re.findall(pattern, html, re.IGNORECASE)
-                for match in matches:
-                    if match and match not in image_urls:
-                        # Clean HTML entities in URLs
-                        clean_url = match.replace('&quot;', '"').replace('&#39;', "'")
-                        image_urls.append(clean_url)
-            
-            # Clean up image URLs - extract actual URLs from JSON-like strings
-            cleaned_image_urls = []
-            for url in image_urls[:10]:  # Take more initially for cleaning
-                if url.startswith('{') and url.endswith('}'):
+            # Enhanced image extraction: take the first 10 distinct matches, expanding
+            # data-a-dynamic-image JSON blobs, and dedupe the final URLs as we go
+            unique_urls = []
+            seen_urls = set()
+            seen_matches = set()
+            taken = 0
+            raw_urls = (match.group(1) for pattern in _IMG_RES for match in pattern.finditer(html))
+            for raw_url in raw_urls:
+                if taken == 10:  # Later patterns are never scanned once we have enough
+                    break
+                if not raw_url or raw_url in seen_matches:
+                    continue
+                # Clean HTML entities in URLs
+                clean_url = raw_url.replace('&quot;', '"').replace('&#39;', "'")
+                seen_matches.add(clean_url)
+                taken += 1
+                if clean_url.startswith('{') and clean_url.endswith('}'):
                     # Extract URLs from JSON-like structure
-                    url_matches = re.findall(r'"([^"]*amazon[^"]*\.(?:jpg|jpeg|png|webp)[^"]*)"', url)
-                    cleaned_image_urls.extend(url_matches)
+                    urls = _JSON_IMG_URL_RE.findall(clean_url)
                 else:
-                    cleaned_image_urls.append(url)
-            
-            # Remove duplicates, but do not limit
-            unique_urls = list(dict.fromkeys(cleaned_image_urls))
+                    urls = (clean_url,)
+                for url in urls:
+                    if url not in seen_urls:
+                        seen_urls.add(url)
+                        unique_urls.append(url)
             
             return {
                 "product_name": product_name,
@@ -833,6 +861,79 @@ class EnhancedAmazonProductAgent:
             logger.error(f"Error parsing enhanced Amazon HTML: {e}")
             return None
     
+    async def fetch_any(self, asin: str, original_url: Optional[str] = None) -> Optional[Tuple[str, Dict]]:
+        """
+        Return product data for an ASIN, from the result cache or by racing the fetch methods
+        
+        Returns:
+            (method name, product data), or None if every method failed
+        """
+        domain = self.get_amazon_domain(original_url) if original_url else 'amazon.com'
+        key = (asin, domain)
+        now = time.monotonic()
+        cached = self._result_cache.pop(key, None)
+        if cached and cached[0] > now:
+            self._result_cache[key] = cached
+            method_name, result = cached[1]
+            return method_name, dict(result)
+        
+        lookup = self._inflight.get(key)
+        if lookup is None:
+            lookup = asyncio.create_task(self._fetch_and_cache(key, asin, original_url))
+            self._inflight[key] = lookup
+            lookup.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shielded so one caller giving up does not cancel the lookup for the others
+        found = await asyncio.shield(lookup)
+        if found:
+            method_name, result = found
+            return method_name, dict(result)
+        return None
+    
+    async def _fetch_and_cache(self, key: Tuple[str, str], asin: str,
+                               original_url: Optional[str]) -> Optional[Tuple[str, Dict]]:
+        """Race the fetch methods and cache a successful result"""
+        found = await self._race_fetchers(asin, original_url)
+        if found:
+            # Drop the oldest entry once full; dicts keep insertion order
+            if len(self._result_cache) >= self.config.RESULT_CACHE_SIZE:
+                self._result_cache.pop(next(iter(self._result_cache)))
+            method_name, result = found
+            self._result_cache[key] = (time.monotonic() + self.config.RESULT_CACHE_TTL, (method_name, dict(result)))
+        return found
+    
+    async def _race_fetchers(self, asin: str, original_url: Optional[str] = None) -> Optional[Tuple[str, Dict]]:
+        """Run all fetch methods concurrently and return the first one that finds the product"""
+        fetchers = (
+            self.fetch_with_rainforest_api(asin),
+            self.fetch_with_scraperapi(asin),
+            self.fetch_with_rapidapi(asin),
+            self.fetch_with_direct_amazon(asin, original_url)
+        )
+        tasks = [asyncio.create_task(fetcher) for fetcher in fetchers]
+        method_names = dict(zip(tasks, self.FETCH_METHODS))
+        pending = set(tasks)
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # If several finish together, prefer them in fallback order
+                for task in sorted(done, key=tasks.index):
+                    method_name = method_names[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.error(f"Error with {method_name}: {e}")
+                        continue
+                    if result and result.get('product_name'):
+                        return method_name, result
+                    logger.warning(f"{method_name} returned no data")
+            return None
+        finally:
+            # Cancel the slower methods once we have an answer
+            for task in pending:
+                task.cancel()
+    
     async def get_product_info(self, input_data: str) -> Dict:
         """
         Main method to get product information with multiple fallback methods
@@ -858,40 +959,32 @@ class EnhancedAmazonProductAgent:
         
         logger.info(f"Fetching product information for ASIN: {asin}")
         
-        # Try multiple APIs and methods in sequence
-        methods = [
-            ('rainforest_api', self.fetch_with_rainforest_api),
-            ('scraperapi', self.fetch_with_scraperapi),
-            ('rapidapi', self.fetch_with_rapidapi),
-            ('direct_amazon', lambda asin: self.fetch_with_direct_amazon(asin, input_data))
-        ]
-        
-        for method_name, method_func in methods:
-            try:
-                logger.info(f"Trying {method_name}...")
-                result = await method_func(asin)
-                if result and result.get('product_name'):
-                    logger.info(f"Successfully retrieved data using {method_name}")
-                    result['source_method'] = method_name
-                    result['asin'] = asin
-                    return result
-                else:
-                    logger.warning(f"{method_name} returned no data")
-            except Exception as e:
-                logger.error(f"Error with {method_name}: {e}")
-                continue
+        found = await self.fetch_any(asin, input_data)
+        if found:
+            method_name, result = found
+            logger.info(f"Successfully retrieved data using {method_name}")
+            result['source_method'] = method_name
+            result['asin'] = asin
+            return result
         
         # If all methods fail, return error
         return {
             "error": "Unable to fetch product information. All methods failed.",
             "asin": asin,
             "suggestion": "Please check if the ASIN is valid or try again later.",
-            "tried_methods": [method[0] for method in methods]
+            "tried_methods": list(self.FETCH_METHODS)
         }
     
     def get_product_info_sync(self, input_data: str) -> Dict:
         """Synchronous wrapper for get_product_info"""
-        return asyncio.run(self.get_product_info(input_data))
+        async def _run() -> Dict:
+            # The session is bound to this event loop, so close it before the loop ends
+            try:
+                return await self.get_product_info(input_data)
+            finally:
+                await self.aclose()
+        
+        return asyncio.run(_run())
 
 
 def main():
@@ -5,93 +5,226 @@ A completely new approach that focuses on getting real prices with correct curre
 """
 
 import asyncio
+import codecs
 import aiohttp
 import re
 import random
 import json
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from itertools import cycle
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 import time
-import ssl
 import certifi
+from lxml import etree, html as lxml_html
+try:  # xlsxwriter writes workbooks several times faster than openpyxl
+    import xlsxwriter  # noqa: F401
+    _EXCEL_ENGINE = 'xlsxwriter'
+except ImportError:
+    _EXCEL_ENGINE = 'openpyxl'
 
-class SimpleAmazonScraper:
-    def __init__(self):
-        """Initialize the simple scraper"""
-        self.user_agents = [
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-        ]
-        
-        # Simple price patterns for each currency
-        self.price_patterns = {
-            'INR': [
-                r'₹(\d+(?:,\d+)*)',
-                r'Rs\.?\s*(\d+(?:,\d+)*)',
-                r'INR\s*(\d+(?:,\d+)*)',
-            ],
-            'USD': [
-                r'\$(\d+(?:\.\d{2})?)',
-                r'USD\s*(\d+(?:\.\d{2})?)',
-            ],
-            'GBP': [
-                r'£(\d+(?:\.\d{2})?)',
-                r'GBP\s*(\d+(?:\.\d{2})?)',
-            ],
-            'EUR': [
-                r'€(\d+(?:\.\d{2})?)',
-                r'EUR\s*(\d+(?:\.\d{2})?)',
-            ],
-            'CAD': [
-                r'C\$\s*(\d+(?:\.\d{2})?)',
-                r'CAD\s*(\d+(?:\.\d{2})?)',
-            ],
-            'AUD': [
-                r'A\$\s*(\d+(?:\.\d{2})?)',
-                r'AUD\s*(\d+(?:\.\d{2})?)',
-            ]
-        }
-        
-        # Currency symbols
-        self.currency_symbols = {
-            'INR': '₹',
-            'USD': '$',
-            'GBP': '£',
-            'EUR': '€',
-            'CAD': 'C$',
-            'AUD': 'A$'
-        }
+# Amazon's own price elements, tried before any currency-symbol scan
+_PRODUCT_PRICE_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'<span[^>]*class="[^"]*a-price-whole[^"]*"[^>]*>(\d+(?:,\d+)*)</span>',
+    r'<span[^>]*class="[^"]*a-offscreen[^"]*"[^>]*>([^<]+)</span>',
+    r'<span[^>]*class="[^"]*a-price[^"]*"[^>]*>([^<]+)</span>',
+))
+
+# Expected currency for each Amazon storefront
+_DOMAIN_CURRENCY = {
+    'amazon.in': 'INR',
+    'amazon.com': 'USD',
+    'amazon.co.uk': 'GBP',
+    'amazon.de': 'EUR',
+    'amazon.ca': 'CAD',
+    'amazon.com.au': 'AUD',
+}
+
+# Currency symbols
+_CURRENCY_SYMBOLS = {
+    'INR': '₹',
+    'USD': '$',
+    'GBP': '£',
+    'EUR': '€',
+    'CAD': 'C$',
+    'AUD': 'A$',
+}
+
+_USER_AGENTS = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+)
+
+# Headers to mimic real browser, one prebuilt set per user agent,
+# rotated round-robin from a random starting order
+_HEADER_CYCLE = cycle([
+    {
+        'User-Agent': user_agent,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Cache-Control': 'max-age=0',
+        'Referer': 'https://www.google.com/'
+    }
+    for user_agent in random.sample(_USER_AGENTS, len(_USER_AGENTS))
+])
+
+# Currency of a price element, by the symbol it contains, in order of precedence
+_PRICE_ELEMENT_CURRENCIES = (
+    ('₹', 'INR'),
+    ('$', 'USD'),
+    ('£', 'GBP'),
+    ('€', 'EUR'),
+    ('C$', 'CAD'),
+    ('A$', 'AUD'),
+)
+
+# Filter/navigation text that contains prices, removed in a single pass before the currency scan
+_EXCLUDE_RE = re.compile(
+    r'(?:Under|Over)\s*[₹$£]\d+|search-alias=|filter=|price-range=',
+    re.IGNORECASE
+)
+
+# Simple price patterns for each currency
+_CURRENCY_PRICE_RES = {
+    currency: tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+    for currency, patterns in {
+        'INR': (
+            r'₹(\d+(?:,\d+)*)',
+            r'Rs\.?\s*(\d+(?:,\d+)*)',
+            r'INR\s*(\d+(?:,\d+)*)',
+        ),
+        'USD': (
+            r'\$(\d+(?:\.\d{2})?)',
+            r'USD\s*(\d+(?:\.\d{2})?)',
+        ),
+        'GBP': (
+            r'£(\d+(?:\.\d{2})?)',
+            r'GBP\s*(\d+(?:\.\d{2})?)',
+        ),
+        'EUR': (
+            r'€(\d+(?:\.\d{2})?)',
+            r'EUR\s*(\d+(?:\.\d{2})?)',
+        ),
+        'CAD': (
+            r'C\$\s*(\d+(?:\.\d{2})?)',
+            r'CAD\s*(\d+(?:\.\d{2})?)',
+        ),
+        'AUD': (
+            r'A\$\s*(\d+(?:\.\d{2})?)',
+            r'AUD\s*(\d+(?:\.\d{2})?)',
+        ),
+    }.items()
+}
+
+_ASIN_RES = tuple(re.compile(pattern) for pattern in (
+    r'/dp/([A-Z0-9]{10})',
+    r'/gp/product/([A-Z0-9]{10})',
+    r'/product/([A-Z0-9]{10})',
+))
+
+_TITLE_RES = tuple(re.compile(pattern, re.DOTALL | re.IGNORECASE) for pattern in (
+    r'<span[^>]*id="productTitle"[^>]*>(.*?)</span>',
+    r'<h1[^>]*id="title"[^>]*>(.*?)</h1>',
+    r'<title[^>]*>(.*?)</title>',
+))
+
+# Description selectors in priority order, compiled to XPath once
+_DESC_XPATHS = tuple(etree.XPath(path) for path in (
+    # Amazon's feature bullets
+    '//div[@data-feature-name="feature-bullets"]//ul//li//span',
+    '//div[@id="feature-bullets"]//ul//li//span',
+    '//div[contains(@class, "feature-bullets")]//ul//li//span',
     
-    def get_domain_currency(self, url: str) -> str:
+    # Product description sections
+    '//div[@id="productDescription"]//p',
+    '//div[contains(@class, "productDescription")]//p',
+    '//div[@id="aplus"]//p',
+    '//div[contains(@class, "aplus")]//p',
+    
+    # Feature list
+    '//div[@id="feature-bullets"]//li',
+    '//div[contains(@class, "feature-bullets")]//li',
+    
+    # Generic description areas
+    '//div[contains(@class, "description")]//p',
+    '//div[contains(@class, "Description")]//p',
+))
+# Text under an element, leaving out script/style/template contents like BeautifulSoup's get_text
+_VISIBLE_TEXT_XPATH = etree.XPath('.//text()[not(parent::script or parent::style or parent::template)]')
+_LXML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+# Result fields exported by save_to_excel, and their column headings
+_EXCEL_COLUMNS = {
+    'url': 'URL',
+    'asin': 'ASIN',
+    'product_name': 'Product Name',
+    'price': 'Price',
+    'currency': 'Currency',
+    'domain': 'Domain',
+    'status': 'Status',
+    'error': 'Error',
+    'description': 'Description',
+}
+
+# How much of a product page to decode and parse before falling back to the whole document
+_HTML_PREFIX_BYTES = 512 * 1024
+
+_NON_PRICE_CHARS_RE = re.compile(r'[^\d.,]')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+
+def _strip_tags(text: str) -> str:
+    """Remove HTML tags, skipping the regex when the text has none"""
+    return _HTML_TAG_RE.sub('', text) if '<' in text else text
+
+
+def _unescape_basic(text: str) -> str:
+    """Decode the apostrophe and ampersand entities Amazon leaves in titles"""
+    if '&' not in text:
+        return text
+    return text.replace('&#39;', "'").replace('&amp;', '&')
+
+
+def _response_encoding(response: aiohttp.ClientResponse) -> str:
+    """Declared charset of a response if Python knows it, UTF-8 otherwise"""
+    if response.charset:
+        try:
+            return codecs.lookup(response.charset).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+class SimpleAmazonScraper:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def get_domain_currency(url: str) -> str:
         """Get expected currency based on Amazon domain"""
-        if 'amazon.in' in url:
-            return 'INR'
-        elif 'amazon.com' in url:
+        netloc = urlparse(url).netloc or urlparse('//' + url).netloc
+        return SimpleAmazonScraper._netloc_currency(netloc)
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _netloc_currency(netloc: str) -> str:
+        """Map a URL's network location to its storefront currency, USD by default"""
+        host = netloc.lower().split(':', 1)[0]
+        start = host.rfind('amazon.')
+        if start == -1:
             return 'USD'
-        elif 'amazon.co.uk' in url:
-            return 'GBP'
-        elif 'amazon.de' in url:
-            return 'EUR'
-        elif 'amazon.ca' in url:
-            return 'CAD'
-        elif 'amazon.com.au' in url:
-            return 'AUD'
-        else:
-            return 'USD'  # Default
+        return _DOMAIN_CURRENCY.get(host[start:], 'USD')
     
-    def extract_asin(self, url: str) -> Optional[str]:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def extract_asin(url: str) -> Optional[str]:
         """Extract ASIN from Amazon URL"""
-        patterns = [
-            r'/dp/([A-Z0-9]{10})',
-            r'/gp/product/([A-Z0-9]{10})',
-            r'/product/([A-Z0-9]{10})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _ASIN_RES:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         return None
@@ -101,82 +234,46 @@ class SimpleAmazonScraper:
         result = {"price": "", "currency": ""}
         
         # First, try to find prices in specific product price elements
-        product_price_patterns = [
-            # Amazon's specific price classes - these are more reliable
-            r'<span[^>]*class="[^"]*a-price-whole[^"]*"[^>]*>(\d+(?:,\d+)*)</span>',
-            r'<span[^>]*class="[^"]*a-offscreen[^"]*"[^>]*>([^<]+)</span>',
-            r'<span[^>]*class="[^"]*a-price[^"]*"[^>]*>([^<]+)</span>',
-        ]
-        
         # Try product-specific patterns first
-        for pattern in product_price_patterns:
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            for match in matches:
+        for pattern in _PRODUCT_PRICE_RES:
+            # Stream matches so the scan stops at the first usable price
+            for found in pattern.finditer(html):
+                match = found.group(1)
                 # Clean the match
-                clean_match = re.sub(r'[^\d.,]', '', match)
+                clean_match = _NON_PRICE_CHARS_RE.sub('', match)
                 if self._is_valid_price(clean_match):
-                    # Determine currency from the original match
-                    if '₹' in match or expected_currency == 'INR':
-                        result["price"] = f"₹{clean_match}"
-                        result["currency"] = "INR"
-                        return result
-                    elif '$' in match or expected_currency == 'USD':
-                        result["price"] = f"${clean_match}"
-                        result["currency"] = "USD"
-                        return result
-                    elif '£' in match or expected_currency == 'GBP':
-                        result["price"] = f"£{clean_match}"
-                        result["currency"] = "GBP"
-                        return result
-                    elif '€' in match or expected_currency == 'EUR':
-                        result["price"] = f"€{clean_match}"
-                        result["currency"] = "EUR"
-                        return result
-                    elif 'C$' in match or expected_currency == 'CAD':
-                        result["price"] = f"C${clean_match}"
-                        result["currency"] = "CAD"
-                        return result
-                    elif 'A$' in match or expected_currency == 'AUD':
-                        result["price"] = f"A${clean_match}"
-                        result["currency"] = "AUD"
+                    # Determine currency from the original match, else the domain's currency
+                    currency = next(
+                        (code for symbol, code in _PRICE_ELEMENT_CURRENCIES
+                         if symbol in match or code == expected_currency),
+                        None
+                    )
+                    if currency:
+                        result["price"] = f"{_CURRENCY_SYMBOLS[currency]}{clean_match}"
+                        result["currency"] = currency
                         return result
         
         # If no product-specific price found, try currency patterns
         # But exclude common filter/navigation text that contains prices
-        exclude_patterns = [
-            r'Under ₹\d+',
-            r'Over ₹\d+',
-            r'Under \$\d+',
-            r'Over \$\d+',
-            r'Under £\d+',
-            r'Over £\d+',
-            r'search-alias=',
-            r'filter=',
-            r'price-range=',
-        ]
-        
-        # Create a cleaned HTML without filter/navigation elements
-        cleaned_html = html
-        for exclude_pattern in exclude_patterns:
-            cleaned_html = re.sub(exclude_pattern, '', cleaned_html, flags=re.IGNORECASE)
+        cleaned_html = _EXCLUDE_RE.sub('', html)
         
         # Now try currency patterns on cleaned HTML
-        if expected_currency in self.price_patterns:
-            for pattern in self.price_patterns[expected_currency]:
-                matches = re.findall(pattern, cleaned_html, re.IGNORECASE)
-                for match in matches:
+        if expected_currency in _CURRENCY_PRICE_RES:
+            for pattern in _CURRENCY_PRICE_RES[expected_currency]:
+                for found in pattern.finditer(cleaned_html):
+                    match = found.group(1)
                     if self._is_valid_price(match):
-                        result["price"] = f"{self.currency_symbols[expected_currency]}{match}"
+                        result["price"] = f"{_CURRENCY_SYMBOLS[expected_currency]}{match}"
                         result["currency"] = expected_currency
                         return result
         
         # If no price found with expected currency, try all currencies
-        for currency, patterns in self.price_patterns.items():
+        for currency, patterns in _CURRENCY_PRICE_RES.items():
             for pattern in patterns:
-                matches = re.findall(pattern, cleaned_html, re.IGNORECASE)
-                for match in matches:
+                for found in pattern.finditer(cleaned_html):
+                    match = found.group(1)
                     if self._is_valid_price(match):
-                        result["price"] = f"{self.currency_symbols[currency]}{match}"
+                        result["price"] = f"{_CURRENCY_SYMBOLS[currency]}{match}"
                         result["currency"] = currency
                         return result
         
@@ -198,37 +295,18 @@ class SimpleAmazonScraper:
     def extract_description_from_html(self, html: str) -> str:
         """Extract product description from HTML"""
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Try multiple description patterns
-            description_patterns = [
-                # Amazon's feature bullets
-                'div[data-feature-name="feature-bullets"] ul li span',
-                'div[id="feature-bullets"] ul li span',
-                'div[class*="feature-bullets"] ul li span',
-                
-                # Product description sections
-                'div[id="productDescription"] p',
-                'div[class*="productDescription"] p',
-                'div[id="aplus"] p',
-                'div[class*="aplus"] p',
-                
-                # Feature list
-                'div[id="feature-bullets"] li',
-                'div[class*="feature-bullets"] li',
-                
-                # Generic description areas
-                'div[class*="description"] p',
-                'div[class*="Description"] p',
-            ]
+            # Parse once with lxml; encoding explicitly keeps XML/charset declarations harmless
+            try:
+                doc = lxml_html.fromstring(html.encode('utf-8'), parser=_LXML_PARSER)
+            except etree.ParserError:  # Nothing but whitespace, comments or stray end tags
+                return "Description not available"
             
             description_parts = []
             
-            for pattern in description_patterns:
-                elements = soup.select(pattern)
-                for element in elements:
-                    text = element.get_text(strip=True)
+            # Try multiple description patterns
+            for xpath in _DESC_XPATHS:
+                for element in xpath(doc):
+                    text = ''.join(piece.strip() for piece in _VISIBLE_TEXT_XPATH(element))
                     if text and len(text) > 10:  # Only meaningful text
                         description_parts.append(text)
                         if len(description_parts) >= 5:  # Limit to 5 bullet points
@@ -244,7 +322,7 @@ class SimpleAmazonScraper:
                 # Remove duplicates and clean text
                 cleaned_parts = []
                 for part in description_parts:
-                    cleaned = re.sub(r'\s+', ' ', part).strip()
+                    cleaned = _WS_RE.sub(' ', part).strip()
                     if cleaned and len(cleaned) > 10 and cleaned not in cleaned_parts:
                         cleaned_parts.append(cleaned)
                 
@@ -264,85 +342,93 @@ class SimpleAmazonScraper:
 
     def extract_product_name(self, html: str) -> str:
         """Extract product name from HTML"""
-        patterns = [
-            r'<span[^>]*id="productTitle"[^>]*>(.*?)</span>',
-            r'<h1[^>]*id="title"[^>]*>(.*?)</h1>',
-            r'<title[^>]*>(.*?)</title>'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, html, re.DOTALL | re.IGNORECASE)
+        for pattern in _TITLE_RES:
+            match = pattern.search(html)
             if match:
-                name = re.sub(r'<[^>]+>', '', match.group(1)).strip()
-                name = name.replace('&#39;', "'").replace('&amp;', '&')
+                name = _unescape_basic(_strip_tags(match.group(1)).strip())
                 return name[:200]  # Limit length
         
         return "Product name not found"
     
-    async def scrape_product(self, url: str) -> Dict:
-        """Scrape a single Amazon product"""
+    def _parse_sync(self, raw: bytes, encoding: str, expected_currency: str) -> Tuple[Dict[str, str], str, str]:
+        """Extract price, product name and description, from the top of the page when it has them all"""
+        # Product details sit in the top of the page, so try decoding and parsing just that first
+        if len(raw) > _HTML_PREFIX_BYTES:
+            found = self._parse_html(raw[:_HTML_PREFIX_BYTES].decode(encoding, errors='replace'), expected_currency)
+            price_data, product_name, description = found
+            if (price_data["price"] and product_name != "Product name not found"
+                    and description != "Description not available"):
+                return found
+        return self._parse_html(raw.decode(encoding, errors='replace'), expected_currency)
+    
+    def _parse_html(self, html: str, expected_currency: str) -> Tuple[Dict[str, str], str, str]:
+        """Extract price, product name and description from a product page"""
+        price_data = self.extract_price_from_html(html, expected_currency)
+        product_name = self.extract_product_name(html)
+        description = self.extract_description_from_html(html)
+        return price_data, product_name, description
+    
+    def _make_connector(self) -> aiohttp.TCPConnector:
+        """Create a pooled connector that doesn't verify certificates"""
+        return aiohttp.TCPConnector(
+            ssl=False,
+            limit=20,
+            limit_per_host=4,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+    
+    async def scrape_product(self, url: str, session: Optional[aiohttp.ClientSession] = None) -> Dict:
+        """Scrape a single Amazon product, reusing the given session if there is one"""
+        if session is None:
+            async with aiohttp.ClientSession(connector=self._make_connector()) as session:
+                return await self.scrape_product(url, session)
+        
         try:
             # Extract ASIN
             asin = self.extract_asin(url)
             if not asin:
                 return {"error": "Could not extract ASIN from URL"}
             
-            # Get expected currency
-            expected_currency = self.get_domain_currency(url)
+            # Get expected currency from the domain, parsing the URL only once
+            domain = urlparse(url).netloc
+            expected_currency = self._netloc_currency(domain)
             
             # Construct clean URL
-            domain = urlparse(url).netloc
             clean_url = f"https://{domain}/dp/{asin}"
             
-            # Headers to mimic real browser
-            headers = {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Cache-Control': 'max-age=0',
-                'Referer': 'https://www.google.com/'
-            }
-            
-            # Create SSL context that doesn't verify certificates
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            # Create connector with SSL context
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
+            # Headers to mimic real browser, rotating through the user agents
+            headers = next(_HEADER_CYCLE)
             
             # Make request
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(clean_url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        
-                        # Extract data
-                        price_data = self.extract_price_from_html(html, expected_currency)
-                        product_name = self.extract_product_name(html)
-                        description = self.extract_description_from_html(html)
-                        
-                        return {
-                            "url": url,
-                            "asin": asin,
-                            "product_name": product_name,
-                            "price": price_data["price"],
-                            "currency": price_data["currency"],
-                            "domain": domain,
-                            "status": "success",
-                            "description": description
-                        }
-                    else:
-                        return {
-                            "url": url,
-                            "asin": asin,
-                            "error": f"HTTP {response.status}",
-                            "status": "error"
-                        }
-                        
+            async with session.get(clean_url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                if response.status == 200:
+                    # Read the whole body so the pooled connection can be reused
+                    raw = await response.read()
+                    
+                    # Extract data in a worker thread so other downloads keep flowing
+                    price_data, product_name, description = await asyncio.get_running_loop().run_in_executor(
+                        None, self._parse_sync, raw, _response_encoding(response), expected_currency
+                    )
+                    
+                    return {
+                        "url": url,
+                        "asin": asin,
+                        "product_name": product_name,
+                        "price": price_data["price"],
+                        "currency": price_data["currency"],
+                        "domain": domain,
+                        "status": "success",
+                        "description": description
+                    }
+                else:
+                    return {
+                        "url": url,
+                        "asin": asin,
+                        "error": f"HTTP {response.status}",
+                        "status": "error"
+                    }
+                    
         except Exception as e:
             return {
                 "url": url,
@@ -351,33 +437,43 @@ class SimpleAmazonScraper:
             }
     
     async def scrape_products_batch(self, urls: List[str], batch_size: int = 5) -> List[Dict]:
-        """Scrape multiple products with batching and delays"""
-        results = []
+        """Scrape multiple products over one session, at most batch_size at a time"""
+        print(f"Processing {len(urls)} URLs, up to {batch_size} at a time")
+        semaphore = asyncio.Semaphore(batch_size)
+        # Start time reserved for the next request
+        next_request_at = 0.0
         
-        for i in range(0, len(urls), batch_size):
-            batch = urls[i:i + batch_size]
-            print(f"Processing batch {i//batch_size + 1}/{(len(urls) + batch_size - 1)//batch_size}")
-            
-            # Process batch concurrently
-            tasks = [self.scrape_product(url) for url in batch]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Handle exceptions
-            for j, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    results.append({
-                        "url": batch[j],
-                        "error": str(result),
-                        "status": "error"
-                    })
-                else:
-                    results.append(result)
+        async def wait_for_request_slot(spacing: float) -> None:
+            """Space request starts at least `spacing` seconds apart"""
+            nonlocal next_request_at
+            now = asyncio.get_running_loop().time()
+            start_at = max(now, next_request_at)
+            next_request_at = start_at + spacing
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+        
+        async with aiohttp.ClientSession(connector=self._make_connector()) as session:
+            async def scrape_bounded(url: str) -> Dict:
+                async with semaphore:
+                    # Spread request starts out to about batch_size requests every 2-5 seconds
+                    await wait_for_request_slot(random.uniform(2, 5) / batch_size)
+                    return await self.scrape_product(url, session)
             
-            # Add delay between batches
-            if i + batch_size < len(urls):
-                delay = random.uniform(2, 5)
-                print(f"Waiting {delay:.1f} seconds before next batch...")
-                await asyncio.sleep(delay)
+            batch_results = await asyncio.gather(
+                *(scrape_bounded(url) for url in urls), return_exceptions=True
+            )
+        
+        # Handle exceptions
+        results = []
+        for url, result in zip(urls, batch_results):
+            if isinstance(result, Exception):
+                results.append({
+                    "url": url,
+                    "error": str(result),
+                    "status": "error"
+                })
+            else:
+                results.append(result)
         
         return results
     
@@ -387,24 +483,10 @@ class SimpleAmazonScraper:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"amazon_products_simple_{timestamp}.xlsx"
         
-        # Prepare data for Excel
-        excel_data = []
-        for result in results:
-            excel_data.append({
-                'URL': result.get('url', ''),
-                'ASIN': result.get('asin', ''),
-                'Product Name': result.get('product_name', ''),
-                'Price': result.get('price', ''),
-                'Currency': result.get('currency', ''),
-                'Domain': result.get('domain', ''),
-                'Status': result.get('status', ''),
-                'Error': result.get('error', ''),
-                'Description': result.get('description', '')
-            })
-        
-        # Create DataFrame and save
-        df = pd.DataFrame(excel_data)
-        df.to_excel(filename, index=False, engine='openpyxl')
+        # Build the sheet straight from the result dicts; missing fields become blanks
+        df = pd.DataFrame.from_records(results, columns=list(_EXCEL_COLUMNS))
+        df = df.fillna('').rename(columns=_EXCEL_COLUMNS)
+        df.to_excel(filename, index=False, engine=_EXCEL_ENGINE)
         
         # Print summary
         successful = len([r for r in results if r.get('status') == 'success'])